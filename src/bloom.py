@@ -0,0 +1,68 @@
+"""
+Compact Bloom filter for large sets of tweet IDs.
+Uses Kirsch–Mitzenmacher double hashing: one blake2b digest split into two 64-bit
+halves gives all k bit positions as (h1 + i*h2) mod m.
+"""
+import math
+import struct
+import hashlib
+from typing import Iterable
+
+_MAGIC = b"ORBF2"
+_HEADER = struct.Struct("<5sQQQQ")  # magic, m bits, k hashes, count, sized capacity
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, int(capacity))
+        self.capacity = capacity
+        m = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.m = max(8, m)
+        self.k = max(1, int(round(self.m / capacity * math.log(2))))
+        self.count = 0
+        self.bits = bytearray((self.m + 7) // 8)
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[str], capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        bf = cls(capacity, error_rate)
+        for tid in ids:
+            bf.add(tid)
+        return bf
+
+    def _positions(self, key: str):
+        d = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", d)
+        m = self.m
+        return ((h1 + i * h2) % m for i in range(self.k))
+
+    def add(self, key: str) -> None:
+        bits = self.bits
+        for p in self._positions(key):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def __contains__(self, key) -> bool:
+        if not key:
+            return False
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def overfull(self) -> bool:
+        """True once more keys were added than it was sized for (FPR climbs past error_rate)."""
+        return self.count > self.capacity
+
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(_MAGIC, self.m, self.k, self.count, self.capacity) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        magic, m, k, count, capacity = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("not a bloom filter file")
+        bf = cls.__new__(cls)
+        bf.m, bf.k, bf.count, bf.capacity = m, k, count, capacity
+        bf.bits = bytearray(data[_HEADER.size:])
+        return bf
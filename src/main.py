@@ -1,41 +1,198 @@
 import os
 import sys
-import json
-from typing import List, Dict, Any
+import re
+import struct
+import hashlib
+import orjson
+import asyncio
+import logging
+import collections
+from typing import List, Dict, Any, Set, Union
 from dotenv import load_dotenv
 
-# Import modules
-from src.scraper import search_posts  
-from src.x_search import search_recent_topics
-from src.telegram_bot import send_drafts  
+# Import modules (search/Telegram/Playwright modules are imported where used, keeping cold start light)
+from src.bloom import BloomFilter
 # from src.poster import post_tweet  # Commented out for now
 
 MANUAL_TWEET_ID = os.getenv("MANUAL_TWEET_ID")
 
+logger = logging.getLogger("orbit")
 
-def load_state() -> List[str]:
-    """Load replied tweet IDs from state.json"""
+
+def _setup_logging() -> None:
+    """Level-gated logging written straight to stdout, the same stream the search and
+    Telegram modules print to, so lines stay in order and none wait in a buffer."""
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), handlers=[stream])
+
+
+STATE_FILE = 'state.ndjson'
+LEGACY_STATE_FILE = 'state.json'
+BLOOM_FILE = 'state.bloom'
+# Above this many IDs, membership checks use a Bloom filter (~1% FPR) instead of a set
+BLOOM_THRESHOLD = 50_000
+# state.bloom prefix: byte offset into state.ndjson covered by the snapshot
+_BLOOM_OFFSET = struct.Struct("<Q")
+# Re-snapshot once the replayed state.ndjson tail exceeds this share of the filter's capacity
+BLOOM_RESNAPSHOT_FRACTION = 0.1
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _migrate_legacy_state() -> None:
+    """One-shot conversion of the old state.json list into state.ndjson."""
+    if os.path.exists(STATE_FILE) or not os.path.exists(LEGACY_STATE_FILE):
+        return
+    try:
+        with open(LEGACY_STATE_FILE, 'rb') as f:
+            ids = orjson.loads(f.read())
+    except orjson.JSONDecodeError:
+        return
+    _atomic_write(STATE_FILE, "".join(f"{tid}\n" for tid in ids if tid).encode())
+
+
+def _iter_ids(f):
+    for line in f:
+        tid = line.strip()
+        if tid:
+            yield tid.decode()
+
+
+def _write_bloom(bloom: BloomFilter, offset: int) -> None:
+    """Snapshot and the state.ndjson offset it covers, replaced together in one atomic write."""
+    _atomic_write(BLOOM_FILE, _BLOOM_OFFSET.pack(offset) + bloom.to_bytes())
+
+
+def _load_bloom(size: int) -> Union[BloomFilter, None]:
+    """Persisted Bloom snapshot plus any IDs appended to state.ndjson after it was taken.
+
+    None (so the caller rebuilds from state.ndjson) if there is no usable snapshot or
+    the replay pushed it past its sized capacity. A long replayed tail is folded into
+    a fresh snapshot so later loads don't replay it again.
+    """
+    try:
+        with open(BLOOM_FILE, 'rb') as f:
+            data = f.read()
+        (offset,) = _BLOOM_OFFSET.unpack_from(data)
+        bloom = BloomFilter.from_bytes(data[_BLOOM_OFFSET.size:])
+    except (OSError, ValueError, struct.error):
+        return None
+    if offset > size:
+        return None
+    replayed = 0
+    with open(STATE_FILE, 'rb') as f:
+        f.seek(offset)
+        for tid in _iter_ids(f):
+            bloom.add(tid)
+            replayed += 1
+        end = f.tell()
+    if bloom.overfull():
+        return None
+    if replayed > bloom.capacity * BLOOM_RESNAPSHOT_FRACTION:
+        _write_bloom(bloom, end)
+    return bloom
+
+
+def load_state() -> Union[Set[str], BloomFilter]:
+    """Load replied tweet IDs from state.ndjson as a set, or a Bloom filter once large."""
+    _migrate_legacy_state()
     try:
-        with open('state.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        return []
+        size = os.path.getsize(STATE_FILE)
+    except OSError:
+        return set()
+
+    bloom = _load_bloom(size)
+    if bloom is not None:
+        return bloom
+
+    with open(STATE_FILE, 'rb') as f:
+        ids = set(_iter_ids(f))
+        end = f.tell()
+    if len(ids) <= BLOOM_THRESHOLD:
+        return ids
+    # Sized at 2x the current IDs, so an overfull snapshot is rebuilt at double capacity
+    bloom = BloomFilter.from_ids(ids, capacity=max(2 * len(ids), 2 * BLOOM_THRESHOLD))
+    _write_bloom(bloom, end)
+    return bloom
 
 
 def save_state(tweet_id: str) -> None:
-    """Append tweet ID to state.json"""
-    replied_ids = load_state()
-    replied_ids.append(tweet_id)
-    
-    with open('state.json', 'w') as f:
-        json.dump(replied_ids, f, indent=2)
+    """Append tweet ID to state.ndjson (O(1); state.bloom catches up on the next load)"""
+    _migrate_legacy_state()
+    with open(STATE_FILE, 'a') as f:
+        f.write(tweet_id + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+_SIMHASH_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9\-]*")
+# Links and @mentions differ between reposts of the same text, so they are ignored
+_SIMHASH_NOISE_RE = re.compile(r"https?://\S+|@\w+")
+# Posts whose 64-bit SimHash differs in at most this many bits count as near-duplicates
+SIMHASH_MAX_DISTANCE = 3
+
+
+def _simhash(text: str) -> int:
+    """64-bit SimHash over lowercase 3+ char tokens, weighted by token frequency.
+
+    0 when there are no such tokens (empty, emoji-, link- or mention-only posts).
+    """
+    v = [0] * 64
+    clean = _SIMHASH_NOISE_RE.sub(" ", (text or "").lower())
+    counts = collections.Counter(w for w in _SIMHASH_TOKEN_RE.findall(clean) if len(w) > 2)
+    if not counts:
+        return 0
+    for tok, weight in counts.items():
+        h = int.from_bytes(hashlib.blake2b(tok.encode(), digest_size=8).digest(), "little")
+        for bit in range(64):
+            v[bit] += weight if (h >> bit) & 1 else -weight
+    return sum(1 << bit for bit in range(64) if v[bit] > 0)
+
+
+def _drop_near_duplicates(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keep the first of each group of near-identical posts (reposts, quote-tweets) so each gets one LLM call."""
+    seen: List[int] = []
+    unique = []
+    for post in posts:
+        sig = _simhash(post.get('text', ''))
+        if not sig:
+            # Nothing to compare on; unrelated token-less posts would all collide at 0
+            unique.append(post)
+            continue
+        if any((sig ^ s).bit_count() <= SIMHASH_MAX_DISTANCE for s in seen):
+            logger.info("⏭️ Skipping %s (near-duplicate text)", post.get('tweet_id'))
+            continue
+        seen.append(sig)
+        unique.append(post)
+    return unique
+
+
+async def _generate_all(posts: List[Dict[str, Any]]) -> List[Any]:
+    """Draft replies for all posts concurrently; failures come back as exceptions."""
+    from src.reply_writer import awrite_reply, aembed_texts, aclose
+    texts = [p.get('text', '') for p in posts]
+    try:
+        # One batched embeddings request feeds the semantic cache for every post
+        embeddings = await aembed_texts(texts)
+        return await asyncio.gather(
+            *[awrite_reply(t, embedding=e) for t, e in zip(texts, embeddings)], return_exceptions=True
+        )
+    finally:
+        await aclose()
 
 
 def main():
     """Main workflow"""
-    print("🚀 ORBIT Agent starting...")
+    _setup_logging()
+    logger.info("🚀 ORBIT Agent starting...")
     
     # Load environment variables
     load_dotenv('.env.local')
@@ -44,14 +201,14 @@ def main():
     required = ["OPENAI_API_KEY", "API_KEY", "API_KEY_SECRET", "X_ACCESS_TOKEN", "X_ACCESS_SECRET"]
     missing = [k for k in required if not os.getenv(k)]
     if missing:
-        print("❌ Missing env keys:", ", ".join(missing))
+        logger.error("❌ Missing env keys: %s", ", ".join(missing))
     # Read TOPICS from env or use default
     topics_str = os.getenv('TOPICS', 'Web3 growth,KOL marketing,Web3 gaming')
     topics = [topic.strip() for topic in topics_str.split(',')]
-    print(f"📋 Topics to search: {topics}")
+    logger.info("📋 Topics to search: %s", topics)
     
     # Search for posts
-    print("🔍 Searching for posts...")
+    logger.info("🔍 Searching for posts...")
     if MANUAL_TWEET_ID:
         from src.x_fetch import get_tweet_text
         from src.reply_writer import write_reply
@@ -61,32 +218,36 @@ def main():
         tweet_text = get_tweet_text(MANUAL_TWEET_ID) or "No text found for this tweet."
         draft_text = write_reply(tweet_text)
 
-        print("Fetched post text:\n", tweet_text, "\n")
-        print("Draft reply:\n", draft_text, "\n")
+        logger.info("Fetched post text:\n %s\n", tweet_text)
+        logger.info("Draft reply:\n %s\n", draft_text)
 
         approved = send_drafts([{"tweet_id": MANUAL_TWEET_ID, "author": "manual", "text": draft_text}])
-        print("Approved:", approved)
+        logger.info("Approved: %s", approved)
 
         if approved.get("action") == "approve":
             resp = post_tweet(approved["text"], in_reply_to=MANUAL_TWEET_ID)
-            print("Posted:", resp)
+            logger.info("Posted: %s", resp)
         else:
-            print("Skipped manual reply.")
+            logger.info("Skipped manual reply.")
         sys.exit(0)
 
+    from src.x_search import search_recent_topics
+    from src.telegram_bot import send_drafts
+
     try:
         # Prefer API-based discovery; fallback to Playwright if empty
         posts = search_recent_topics(topics, limit_per_topic=2)
         if not posts:
+            from src.scraper import search_posts
             posts = search_posts(topics, limit=3)
-        print(f"✅ Found {len(posts)} posts")
+        logger.info("✅ Found %d posts", len(posts))
         
         if not posts:
-            print("❌ No posts found to reply to")
+            logger.info("❌ No posts found to reply to")
             return
             
     except Exception as e:
-        print(f"❌ Error searching posts: {e}")
+        logger.error("❌ Error searching posts: %s", e)
         try:
             from src.telegram_bot import notify_error
             notify_error(f"Search failure: {e}")
@@ -96,58 +257,62 @@ def main():
     
     # Load existing replied tweet IDs to avoid duplicates
     replied_ids = load_state()
-    print(f"📝 Already replied to {len(replied_ids)} tweets")
+    logger.info("📝 Already replied to %d tweets", len(replied_ids))
     
     # Generate candidate replies
-    print("🤖 Generating reply candidates...")
+    logger.info("🤖 Generating reply candidates...")
     candidates = []
-    
+    fresh = []
+
     for post in posts:
         tweet_id = post.get('tweet_id')
         
         # Skip if we've already replied to this tweet
         if tweet_id in replied_ids:
-            print(f"⏭️ Skipping {tweet_id} (already replied)")
+            logger.debug("⏭️ Skipping %s (already replied)", tweet_id)
             continue
-            
-        try:
-            # Use the same LLM writer as manual flow
-            from src.reply_writer import write_reply
-            reply_text = write_reply(post.get('text', ''))
-            
-            candidate = {
-                "tweet_id": tweet_id,
-                "author": post.get('handle') or post.get('author', 'unknown'),
-                "text": reply_text
-            }
-            candidates.append(candidate)
-            print(f"✅ Generated reply for @{candidate['author']}: {reply_text[:50]}...")
-            
-        except Exception as e:
-            print(f"❌ Error generating reply for {tweet_id}: {e}")
+        fresh.append(post)
+    fresh = _drop_near_duplicates(fresh)
+
+    # Use the same LLM writer as manual flow, one concurrent call per post
+    replies = asyncio.run(_generate_all(fresh))
+
+    for post, reply_text in zip(fresh, replies):
+        tweet_id = post.get('tweet_id')
+        if isinstance(reply_text, Exception):
+            logger.error("❌ Error generating reply for %s: %s", tweet_id, reply_text)
             continue
+
+        candidate = {
+            "tweet_id": tweet_id,
+            "author": post.get('handle') or post.get('author', 'unknown'),
+            "text": reply_text
+        }
+        candidates.append(candidate)
+        logger.info("✅ Generated reply for @%s", candidate['author'])
+        logger.debug("   %s...", reply_text[:50])
     
     if not candidates:
-        print("❌ No new candidates to review")
+        logger.info("❌ No new candidates to review")
         return
     
-    print(f"📝 {len(candidates)} candidates ready for review")
+    logger.info("📝 %d candidates ready for review", len(candidates))
     
     # Send drafts for approval
-    print("📤 Sending drafts to Telegram for approval...")
+    logger.info("📤 Sending drafts to Telegram for approval...")
     try:
         approval_result = send_drafts(candidates)
-        print(f"📋 Approval result: {approval_result}")
+        logger.info("📋 Approval result: %s", approval_result)
 
-        # Post immediately if approved; otherwise print Skipped and exit
+        # Post immediately if approved; otherwise log Skipped and exit
         approved = approval_result
         from src.poster import post_tweet
         if approved.get("action") == "approve":
             try:
                 resp = post_tweet(approved["text"], in_reply_to=approved["tweet_id"])
-                print("Posted:", resp)
+                logger.info("Posted: %s", resp)
             except Exception as e:
-                print(f"❌ Error posting tweet: {e}")
+                logger.error("❌ Error posting tweet: %s", e)
                 try:
                     from src.telegram_bot import notify_error
                     notify_error(f"Post failure: {e}")
@@ -155,11 +320,11 @@ def main():
                     pass
                 return
         else:
-            print("Skipped.")
+            logger.info("Skipped.")
             return
             
     except Exception as e:
-        print(f"❌ Error sending drafts: {e}")
+        logger.error("❌ Error sending drafts: %s", e)
         try:
             from src.telegram_bot import notify_error
             notify_error(f"Telegram approval failure: {e}")
@@ -167,19 +332,19 @@ def main():
             pass
         return
     
-    # After approval, just print what would be posted
+    # After approval, just log what would be posted
     approved_text = approval_result.get('text')
     approved_tweet_id = approval_result.get('tweet_id')
     
     if not approved_text or not approved_tweet_id:
-        print("❌ Missing approval data")
+        logger.error("❌ Missing approval data")
         return
     
-    print("Would post:", approved_text)
+    logger.info("Would post: %s", approved_text)
     
-    # Append approved tweet_id to state.json
+    # Append approved tweet_id to state.ndjson
     save_state(approved_tweet_id)
-    print("State updated.")
+    logger.info("State updated.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+"""
+Shared mock posts for the dry-run scripts (test_flow, test_openai_flow, test_scrape_safe).
+Shaped like scraper / x_search results; read-only so one copy can be shared.
+"""
+from types import MappingProxyType
+
+MOCK_POSTS = tuple(MappingProxyType(p) for p in (
+    {
+        "id": "1234567890123456789",
+        "tweet_id": "1234567890123456789",
+        "handle": "web3builder",
+        "text": "Just launched our new DeFi protocol! Super excited about bringing decentralized finance to more users. The composability is insane! #web3 #DeFi",
+        "url": "https://twitter.com/web3builder/status/1234567890123456789",
+        "verified": True,
+        "followers": 25000,
+    },
+    {
+        "id": "9876543210987654321",
+        "tweet_id": "9876543210987654321",
+        "handle": "cryptoinfluencer",
+        "text": "Web3 gaming is changing everything. True ownership of in-game assets means players finally have real value. What's your favorite web3 game? 🎮",
+        "url": "https://twitter.com/cryptoinfluencer/status/9876543210987654321",
+        "verified": False,
+        "followers": 50000,
+    },
+    {
+        "id": "5555555555555555555",
+        "tweet_id": "5555555555555555555",
+        "handle": "nftcollector",
+        "text": "The intersection of AI and blockchain is fascinating. We're seeing real-world applications that weren't possible before. Excited for what's next!",
+        "url": "https://twitter.com/nftcollector/status/5555555555555555555",
+        "verified": True,
+        "followers": 15000,
+    },
+))
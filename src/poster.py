@@ -1,10 +1,32 @@
-import os, requests, json
+import os, requests
+import orjson
+import functools
+import logging
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth1
-import time
+from urllib3.util.retry import Retry
 
+logger = logging.getLogger("orbit.poster")
 
+# One pooled session for the process: TLS is negotiated once, and urllib3 retries
+# rate limit/transient errors with backoff, honoring Retry-After.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+        raise_on_status=False,
+    ),
+))
+
+
+@functools.lru_cache(maxsize=1)
 def _auth():
-    from requests_oauthlib import OAuth1
+    """OAuth1 signer, built once: user-context tokens don't expire, so there's nothing to refresh."""
     return OAuth1(
         os.getenv("API_KEY"),
         os.getenv("API_KEY_SECRET"),
@@ -18,16 +40,11 @@ def post_tweet(text: str, in_reply_to: str | None = None) -> dict:
     payload = {"text": text}
     if in_reply_to:
         payload["reply"] = {"in_reply_to_tweet_id": in_reply_to}
-    # basic retry on rate limit/transient errors
-    for i in range(3):
-        r = requests.post(url, auth=_auth(), json=payload, timeout=20)
-        if r.status_code not in (429, 500, 502, 503, 504):
-            break
-        time.sleep(2 * (i + 1))
+    r = _SESSION.post(url, auth=_auth(), json=payload, timeout=20)
     try:
-        data = r.json()
+        data = orjson.loads(r.content)
     except Exception:
         data = {"raw": r.text}
     if r.status_code not in (200, 201):
-        print("X error:", r.status_code, data)
+        logger.error("X error: %s %s", r.status_code, data)
     return data
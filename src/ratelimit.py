@@ -0,0 +1,88 @@
+"""
+Client-side token bucket for OpenAI calls.
+Tracks request and token capacity replenished continuously at the account's RPM/TPM,
+so callers wait just long enough instead of hitting 429s and backing off blindly.
+"""
+import os
+import time
+import asyncio
+import threading
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to ~4 chars per token
+    tiktoken = None
+
+_encodings = {}
+
+
+def estimate_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """Token count for `text`, exact when tiktoken is installed."""
+    if tiktoken is None:
+        return len(text or "") // 4 + 1
+    enc = _encodings.get(model)
+    if enc is None:
+        try:
+            enc = tiktoken.encoding_for_model(model)
+        except KeyError:
+            enc = tiktoken.get_encoding("o200k_base")
+        _encodings[model] = enc
+    return len(enc.encode(text or ""))
+
+
+class TokenBucket:
+    """Request + token budget refilled at max_*_per_minute / 60 per second."""
+
+    def __init__(self, max_requests_per_minute: float, max_tokens_per_minute: float):
+        self.max_requests_per_minute = float(max_requests_per_minute)
+        self.max_tokens_per_minute = float(max_tokens_per_minute)
+        self.available_request_capacity = self.max_requests_per_minute
+        self.available_token_capacity = self.max_tokens_per_minute
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, tokens: int) -> float:
+        """Consume capacity and return 0, or return seconds until it would be available."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last
+            self._last = now
+            self.available_request_capacity = min(
+                self.max_requests_per_minute,
+                self.available_request_capacity + self.max_requests_per_minute * elapsed / 60.0,
+            )
+            self.available_token_capacity = min(
+                self.max_tokens_per_minute,
+                self.available_token_capacity + self.max_tokens_per_minute * elapsed / 60.0,
+            )
+            tokens = min(tokens, self.max_tokens_per_minute)
+            if self.available_request_capacity >= 1 and self.available_token_capacity >= tokens:
+                self.available_request_capacity -= 1
+                self.available_token_capacity -= tokens
+                return 0.0
+            wait_requests = (1 - self.available_request_capacity) * 60.0 / self.max_requests_per_minute
+            wait_tokens = (tokens - self.available_token_capacity) * 60.0 / self.max_tokens_per_minute
+            return max(wait_requests, wait_tokens, 0.01)
+
+    def acquire(self, est_tokens: int = 1) -> None:
+        """Block until one request of `est_tokens` fits in the budget."""
+        while True:
+            wait = self._take(est_tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self, est_tokens: int = 1) -> None:
+        """Async counterpart of acquire()."""
+        while True:
+            wait = self._take(est_tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+# Shared budget for chat completions; tune to the account tier.
+OPENAI_BUCKET = TokenBucket(
+    max_requests_per_minute=float(os.getenv("OPENAI_MAX_RPM", "500")),
+    max_tokens_per_minute=float(os.getenv("OPENAI_MAX_TPM", "200000")),
+)
@@ -0,0 +1,170 @@
+"""
+Reply cache for write_reply.
+Exact-match lookups by request hash, then semantic lookups by embedding similarity,
+so near-duplicate posts reuse a reply instead of paying for another LLM round-trip.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from collections import OrderedDict
+from typing import Optional, List
+
+import numpy as np
+
+EMBED_MODEL = "text-embedding-3-small"
+EMBED_DIM = 1536
+MEMO_SIZE = 2048
+
+
+def cache_key(model: str, messages: list, temperature: float) -> str:
+    """Stable SHA-256 of the canonical chat request."""
+    payload = {"model": model, "messages": messages, "temperature": temperature}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+SCHEMA_VERSION = 3
+SCORE_CHUNK = 4096  # rows dequantized per BLAS call during lookup
+
+
+def _normalize(v) -> np.ndarray:
+    v = np.asarray(v, dtype=np.float32)
+    return v / max(float(np.linalg.norm(v)), 1e-12)
+
+
+def _quantize(v: np.ndarray):
+    """Symmetric per-row int8 quantization: v ≈ q * scale."""
+    scale = max(float(np.abs(v).max()) / 127.0, 1e-12)
+    return np.round(v / scale).astype(np.int8), np.float32(scale)
+
+
+class ReplyCache:
+    """sqlite-backed store of (key, row, reply, tone) records plus an embedding matrix.
+
+    Embeddings are L2-normalized, quantized to int8 with one float32 scale per row,
+    and appended to contiguous files (`<db>.embs.i8`, `<db>.scales.f32`) that are
+    memory-mapped as an (N, EMBED_DIM) matrix: 1.5 KB per row instead of 6 KB.
+    Lookups dequantize in chunks and score with float32 BLAS; the cosine error from
+    quantization is ~1e-3, well under the similarity threshold margin.
+    Exact-match hits are served from a small in-process LRU before touching sqlite.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.92):
+        self.path = path
+        stem = os.path.splitext(path)[0]
+        self.emb_path = stem + ".embs.i8"
+        self.scale_path = stem + ".scales.f32"
+        self.threshold = threshold
+        self._db: Optional[sqlite3.Connection] = None
+        self._E: Optional[np.ndarray] = None
+        self._S: Optional[np.ndarray] = None
+        self._replies: List[Optional[str]] = []
+        self._tones: List[Optional[str]] = []
+        self._memo: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = {"hits": 0, "semantic_hits": 0, "misses": 0}
+
+    def _remember(self, key: str, reply: str) -> None:
+        self._memo[key] = reply
+        self._memo.move_to_end(key)
+        if len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            self._db = sqlite3.connect(self.path, isolation_level=None)
+            if self._db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # Older cache layout: it's only a cache, so start fresh
+                self._db.execute("DROP TABLE IF EXISTS replies")
+                for f in (self.emb_path, self.scale_path):
+                    if os.path.exists(f):
+                        os.remove(f)
+                self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS replies ("
+                "key TEXT PRIMARY KEY, row INTEGER, reply TEXT NOT NULL, tone TEXT, ts REAL)"
+            )
+        return self._db
+
+    def _rows(self) -> int:
+        try:
+            return min(os.path.getsize(self.emb_path) // EMBED_DIM, os.path.getsize(self.scale_path) // 4)
+        except OSError:
+            return 0
+
+    def _map(self) -> None:
+        n = self._rows()
+        if n:
+            self._E = np.memmap(self.emb_path, dtype=np.int8, mode="r", shape=(n, EMBED_DIM))
+            self._S = np.memmap(self.scale_path, dtype=np.float32, mode="r", shape=(n,))
+        else:
+            self._E = np.empty((0, EMBED_DIM), dtype=np.int8)
+            self._S = np.empty((0,), dtype=np.float32)
+
+    def _scores(self, q: np.ndarray) -> np.ndarray:
+        sims = np.empty(len(self._E), dtype=np.float32)
+        for start in range(0, len(self._E), SCORE_CHUNK):
+            block = self._E[start:start + SCORE_CHUNK].astype(np.float32)
+            sims[start:start + len(block)] = (block @ q) * self._S[start:start + len(block)]
+        return sims
+
+    def _load(self) -> None:
+        conn = self._conn()
+        self._map()
+        n = len(self._E)
+        self._replies = [None] * n
+        self._tones = [None] * n
+        for row, reply, tone in conn.execute("SELECT row, reply, tone FROM replies WHERE row IS NOT NULL"):
+            if row < n:
+                self._replies[row] = reply
+                self._tones[row] = tone
+
+    def get(self, key: str) -> Optional[str]:
+        """Exact-match lookup by request hash."""
+        reply = self._memo.get(key)
+        if reply is None:
+            row = self._conn().execute("SELECT reply FROM replies WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            reply = row[0]
+        self._remember(key, reply)
+        self.stats["hits"] += 1
+        return reply
+
+    def nearest(self, embedding: np.ndarray, tone: str) -> Optional[str]:
+        """Return the cached reply most similar to `embedding` if it clears the threshold and tone matches."""
+        if self._E is None:
+            self._load()
+        if not len(self._E):
+            return None
+        sims = self._scores(_normalize(embedding))
+        i = int(sims.argmax())
+        if sims[i] >= self.threshold and self._tones[i] == tone and self._replies[i] is not None:
+            self.stats["semantic_hits"] += 1
+            return self._replies[i]
+        return None
+
+    def put(self, key: str, embedding: Optional[np.ndarray], reply: str, tone: str) -> None:
+        self.stats["misses"] += 1
+        self._remember(key, reply)
+        conn = self._conn()
+        row = None
+        if embedding is not None:
+            row = self._rows()
+            q, scale = _quantize(_normalize(embedding))
+            with open(self.emb_path, "ab") as f:
+                f.write(q.tobytes())
+            with open(self.scale_path, "ab") as f:
+                f.write(scale.tobytes())
+        conn.execute(
+            "INSERT OR REPLACE INTO replies (key, row, reply, tone, ts) VALUES (?, ?, ?, ?, ?)",
+            (key, row, reply, tone, time.time()),
+        )
+        if row is not None and self._E is not None:
+            # Re-map to cover the grown file
+            self._map()
+            self._replies.append(reply)
+            self._tones.append(tone)
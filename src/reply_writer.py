@@ -1,8 +1,22 @@
 import os
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import re, collections
+import logging
+import asyncio
+import httpx
+import numpy as np
+from src.reply_cache import ReplyCache, cache_key, EMBED_MODEL
+from src.ratelimit import OPENAI_BUCKET, estimate_tokens
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger("orbit.reply_writer")
+
+# Semantic reply cache: near-duplicate posts with the same tone reuse one reply.
+# Set ORBIT_REPLY_CACHE=off to disable.
+REPLY_CACHE_PATH = os.getenv("ORBIT_REPLY_CACHE", ".cache/replies.db")
+_REPLY_CACHE = None if REPLY_CACHE_PATH.lower() == "off" else ReplyCache(
+    REPLY_CACHE_PATH, threshold=float(os.getenv("ORBIT_CACHE_THRESHOLD", "0.92"))
+)
 
 # Optional dials from env (no code changes needed later)
 ORBIT_TONE = os.getenv("ORBIT_TONE", "playful")      # playful | strategic | cosmic
@@ -46,48 +60,145 @@ End each reply either cleanly or with a light question if it fits naturally.
 Output only the final reply text.
 """
 
-def _detect_tone_from_post(post_text: str) -> str:
-    """Rough heuristic to pick tone automatically."""
-    t = (post_text or "").lower()
-    if any(w in t for w in ["stability", "testing", "edge case", "edge cases", "bug", "latency", "incident", "rollout"]):
-        return "strategic"
-    if "why" in t or "how" in t or "what" in t or "think" in t or "idea" in t:
-        return "strategic"
-    if "launch" in t or "partnership" in t or "drop" in t or "soon" in t or "alpha" in t:
-        return "playful"
-    if "future" in t or "vision" in t or "universe" in t or "orbit" in t or "space" in t:
-        return "cosmic"
-    if "scam" in t or "rug" in t or "problem" in t or "fix" in t or "issue" in t:
-        return "strategic"
-    if "gm" in t or "wagmi" in t or "vibe" in t:
-        return "playful"
+# Tone cue words; dict order breaks ties (strategic first, as the fallback)
+_TONE_WORDS = {
+    "strategic": frozenset({
+        "stability", "testing", "edge", "bug", "bugs", "latency", "incident", "incidents", "rollout",
+        "why", "how", "what", "think", "idea", "ideas",
+        "scam", "rug", "problem", "problems", "fix", "fixes", "issue", "issues",
+    }),
+    "playful": frozenset({
+        "launch", "launched", "launching", "partnership", "drop", "drops", "soon", "alpha",
+        "gm", "wagmi", "vibe", "vibes",
+    }),
+    "cosmic": frozenset({"future", "vision", "universe", "orbit", "space"}),
+}
+# One lowercase tokenizer shared by tone detection and keyword extraction.
+# Keeps 2-letter cues like "gm" and hyphenated words like "play-to-earn".
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9\-]*")
+
+STOP = frozenset("the a an and or but with without into onto from for of on in at to as is are was were been be it this that those these we you they i our your their not just only".split())
+
+
+def _tone_from_words(words: list) -> str:
+    toks = set(words)
+    toks.update([part for w in toks if "-" in w for part in w.split("-")])
+    scores = {tone: len(toks & cues) for tone, cues in _TONE_WORDS.items()}
+    best = max(scores, key=scores.get)
     # default fallback
-    return "strategic"
+    return best if scores[best] else "strategic"
+
+
+def _keywords_from_words(words: list, k: int) -> list:
+    # Keyword tokens are 3+ chars and start with a letter
+    counts = collections.Counter(
+        w for w in words if len(w) > 2 and w[0].isalpha() and w not in STOP
+    )
+    return [w for w, _ in counts.most_common(k)]
 
 
-STOP = set("the a an and or but with without into onto from for of on in at to as is are was were been be it this that those these we you they i our your their not just only".split())
+def _analyze(post_text: str, k: int = 5):
+    """Tokenize the post once and return (tone, top-k keywords)."""
+    words = _WORD_RE.findall((post_text or "").lower())
+    return _tone_from_words(words), _keywords_from_words(words, k)
+
+
+def _detect_tone_from_post(post_text: str) -> str:
+    """Rough heuristic to pick tone automatically."""
+    return _tone_from_words(_WORD_RE.findall((post_text or "").lower()))
+
 
 def _keywords(text: str, k: int = 5):
-    words = re.findall(r"[A-Za-z][A-Za-z0-9\-]{2,}", text.lower())
-    words = [w for w in words if w not in STOP and not w.isdigit()]
-    counts = collections.Counter(words)
-    return [w for w, _ in counts.most_common(k)]
+    return _keywords_from_words(_WORD_RE.findall((text or "").lower()), k)
 
-def write_reply(post_text: str) -> str:
-    """Generate one ORBIT-style reply from the post text with adaptive tone and keyword anchoring."""
-    if not (post_text or "").strip():
-        return "Not much to react to here—what outcome are you aiming for?"
-
-    tone = _detect_tone_from_post(post_text)
-    tone_map = {
-        "playful": "witty, appreciative, lightly sarcastic; add a wink, keep it sharp.",
-        "strategic": "concise, insightful, appreciative; one practical lens that hints at real traction.",
-        "cosmic": "playful cosmic builder; one gentle orbit/gravity metaphor, never overdone.",
-    }
-    kws = _keywords(post_text, k=5)
-    must_use = ", ".join(kws[:3]) if kws else ""
 
-    SYSTEM_PROMPT = f"""
+EMPTY_POST_REPLY = "Not much to react to here—what outcome are you aiming for?"
+REPLY_MODEL = "gpt-4o-mini"
+REPLY_TEMPERATURE = 0.7      # playful but controlled
+
+
+_aclient = None
+_aclient_loop = None
+
+
+def _get_aclient() -> AsyncOpenAI:
+    """AsyncOpenAI client for the running loop, created on first use so sync-only callers never build it.
+
+    Backed by one HTTP/2 httpx pool, so concurrent awrite_reply calls multiplex over a
+    single TLS connection instead of opening one each. httpx pools are bound to the
+    loop they were opened on, so a new loop (e.g. a second asyncio.run) gets a fresh client.
+    """
+    global _aclient, _aclient_loop
+    loop = asyncio.get_running_loop()
+    if _aclient is None or _aclient_loop is not loop:
+        http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=30.0,
+        )
+        _aclient = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http)
+        _aclient_loop = loop
+    return _aclient
+
+
+async def aclose() -> None:
+    """Close this loop's pooled client; await it before the loop that used awrite_reply ends."""
+    global _aclient, _aclient_loop
+    if _aclient is not None and _aclient_loop is asyncio.get_running_loop():
+        client, _aclient, _aclient_loop = _aclient, None, None
+        await client.close()
+
+
+EMBED_BATCH = 2048  # max inputs per embeddings request
+
+
+def _embed(text: str):
+    """Embed text for the semantic cache; None on failure so generation still proceeds."""
+    try:
+        resp = client.embeddings.create(model=EMBED_MODEL, input=text)
+        return np.asarray(resp.data[0].embedding, dtype=np.float32)
+    except Exception as e:
+        logger.warning("reply cache embedding error: %s", e)
+        return None
+
+
+async def _aembed_batch(texts: list) -> list:
+    resp = await _get_aclient().embeddings.create(model=EMBED_MODEL, input=texts)
+    return [np.asarray(d.embedding, dtype=np.float32) for d in sorted(resp.data, key=lambda d: d.index)]
+
+
+async def _aembed(text: str):
+    try:
+        return (await _aembed_batch([text]))[0]
+    except Exception as e:
+        logger.warning("reply cache embedding error: %s", e)
+        return None
+
+
+async def aembed_texts(texts: list) -> list:
+    """Embed many posts in as few requests as possible (one per EMBED_BATCH inputs).
+
+    Returns one embedding (or None) per input, for passing to awrite_reply(embedding=...).
+    """
+    out = [None] * len(texts)
+    if _REPLY_CACHE is None:
+        return out
+    idx = [i for i, t in enumerate(texts) if (t or "").strip()]
+    for start in range(0, len(idx), EMBED_BATCH):
+        chunk = idx[start:start + EMBED_BATCH]
+        try:
+            embs = await _aembed_batch([texts[i] for i in chunk])
+        except Exception as e:
+            logger.warning("reply cache embedding error: %s", e)
+            continue
+        for i, emb in zip(chunk, embs):
+            out[i] = emb
+    return out
+
+
+# Tone/keyword-independent instructions: byte-identical on every call so the
+# provider's prompt-prefix cache can reuse it. Per-post details go in a second message.
+_STATIC_SYSTEM = """
     You are ORBIT Agent — voice of @explore_thecore.
     You reply ONLY if you can find a real, meaningful connection to the post.
     If there’s no good angle, drop a short witty neutral observation or skip.
@@ -102,22 +213,157 @@ def write_reply(post_text: str) -> str:
     - Write as a reply to the post, not commentary about it; avoid meta phrases like "this post"
 
     Additional:
-    - Use the {tone.upper()} tone: {tone_map[tone]}
-    - Explicitly reference at least ONE of these keywords (if present): {must_use}
+    - Use the tone given below.
+    - Explicitly reference at least ONE of the keywords given below (if present).
     - If the post mentions stability/testing/edge cases, acknowledge it and add one practical lens.
     - Output ONLY the final one-line reply without hashtags or links.
     """
 
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": f"Post:\n{post_text}\n\nWrite one short, context-anchored reply:"},
-        ],
+_TONE_MAP = {
+    "playful": "witty, appreciative, lightly sarcastic; add a wink, keep it sharp.",
+    "strategic": "concise, insightful, appreciative; one practical lens that hints at real traction.",
+    "cosmic": "playful cosmic builder; one gentle orbit/gravity metaphor, never overdone.",
+}
+
+
+def _build_messages(post_text: str):
+    """Return (tone, messages) for one post."""
+    tone, kws = _analyze(post_text, k=5)
+    must_use = ", ".join(kws[:3]) if kws else ""
+    dynamic = f"Tone: {tone.upper()} — {_TONE_MAP[tone]}\nKeywords to reference: {must_use}"
+
+    messages = [
+        {"role": "system", "content": _STATIC_SYSTEM},
+        {"role": "system", "content": dynamic},
+        {"role": "user", "content": f"Post:\n{post_text}\n\nWrite one short, context-anchored reply:"},
+    ]
+    return tone, messages
+
+
+def _chat_kwargs(messages: list) -> dict:
+    return dict(
+        model=REPLY_MODEL,
+        messages=messages,
         max_tokens=90,
-        temperature=0.7,      # playful but controlled
+        temperature=REPLY_TEMPERATURE,
         presence_penalty=0.1,
         frequency_penalty=0.2,
     )
-    text = (resp.choices[0].message.content or "").strip()
-    return " ".join(text.split())[:200]
+
+
+def _est_tokens(messages: list, max_tokens: int = 90) -> int:
+    """Prompt + completion budget for the token bucket."""
+    return sum(estimate_tokens(m["content"], REPLY_MODEL) for m in messages) + max_tokens
+
+
+STREAM_STOP_CHARS = 220  # replies are cut to 200 chars; stop reading a little past that
+
+
+def _delta(chunk) -> str:
+    return (chunk.choices[0].delta.content or "") if chunk.choices else ""
+
+
+def _read_stream(stream) -> str:
+    """Accumulate streamed deltas, closing the response once enough text has arrived."""
+    buf, n = [], 0
+    try:
+        for chunk in stream:
+            piece = _delta(chunk)
+            buf.append(piece)
+            n += len(piece)
+            if n >= STREAM_STOP_CHARS:
+                break
+    finally:
+        stream.close()
+    return "".join(buf)
+
+
+async def _aread_stream(stream) -> str:
+    buf, n = [], 0
+    try:
+        async for chunk in stream:
+            piece = _delta(chunk)
+            buf.append(piece)
+            n += len(piece)
+            if n >= STREAM_STOP_CHARS:
+                break
+    finally:
+        await stream.close()
+    return "".join(buf)
+
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _clean(text: str, limit: int = 200) -> str:
+    """Collapse whitespace and cut to `limit` chars, on a word boundary when one exists."""
+    s = _WS_RE.sub(" ", (text or "").strip())
+    if len(s) <= limit:
+        return s
+    head = s[:limit + 1]
+    space = head.rfind(" ")
+    return head[:space] if space > 0 else s[:limit]
+
+
+def _store(key, embedding, reply: str, tone: str) -> str:
+    if _REPLY_CACHE is not None and reply:
+        _REPLY_CACHE.put(key, embedding, reply, tone)
+    return reply
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters of the reply cache for this process ({} when it is disabled)."""
+    return dict(_REPLY_CACHE.stats) if _REPLY_CACHE is not None else {}
+
+
+def write_reply(post_text: str, embedding=None) -> str:
+    """Generate one ORBIT-style reply from the post text with adaptive tone and keyword anchoring.
+
+    `embedding` may carry a precomputed post embedding so the semantic cache skips its own call.
+    """
+    if not (post_text or "").strip():
+        return EMPTY_POST_REPLY
+
+    tone, messages = _build_messages(post_text)
+
+    key = None
+    if _REPLY_CACHE is not None:
+        key = cache_key(REPLY_MODEL, messages, REPLY_TEMPERATURE)
+        cached = _REPLY_CACHE.get(key)
+        if cached:
+            return cached
+        if embedding is None:
+            embedding = _embed(post_text)
+        if embedding is not None:
+            cached = _REPLY_CACHE.nearest(embedding, tone)
+            if cached:
+                return cached
+
+    OPENAI_BUCKET.acquire(_est_tokens(messages))
+    stream = client.chat.completions.create(**_chat_kwargs(messages), stream=True)
+    return _store(key, embedding, _clean(_read_stream(stream)), tone)
+
+
+async def awrite_reply(post_text: str, embedding=None) -> str:
+    """Async counterpart of write_reply, so callers can generate many replies concurrently."""
+    if not (post_text or "").strip():
+        return EMPTY_POST_REPLY
+
+    tone, messages = _build_messages(post_text)
+
+    key = None
+    if _REPLY_CACHE is not None:
+        key = cache_key(REPLY_MODEL, messages, REPLY_TEMPERATURE)
+        cached = _REPLY_CACHE.get(key)
+        if cached:
+            return cached
+        if embedding is None:
+            embedding = await _aembed(post_text)
+        if embedding is not None:
+            cached = _REPLY_CACHE.nearest(embedding, tone)
+            if cached:
+                return cached
+
+    await OPENAI_BUCKET.aacquire(_est_tokens(messages))
+    stream = await _get_aclient().chat.completions.create(**_chat_kwargs(messages), stream=True)
+    return _store(key, embedding, _clean(await _aread_stream(stream)), tone)
@@ -1,9 +1,121 @@
 import os
 import re
-from typing import List, Dict, Any
-from playwright.sync_api import sync_playwright, Page, Browser
+from typing import List, Dict, Any, FrozenSet, Iterable
+from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
 from urllib.parse import quote
-import time
+import atexit
+import asyncio
+import functools
+import threading
+
+_SEL_TWEET = 'article[data-testid="tweet"]'
+_SEL_CELL = '[data-testid="cellInnerDiv"]'
+_SEL_STATUS_LINK = 'a[href*="/status/"]'
+_SEL_TWEET_TEXT = '[data-testid="tweetText"]'
+_SEL_HANDLE_LINK = 'a[href^="/"][role="link"]'
+_SEL_VERIFIED = '[data-testid="icon-verified"]'
+_SELECTORS = {
+    "tweet": _SEL_TWEET,
+    "cell": _SEL_CELL,
+    "link": _SEL_STATUS_LINK,
+    "text": _SEL_TWEET_TEXT,
+    "handle": _SEL_HANDLE_LINK,
+    "verified": _SEL_VERIFIED,
+}
+_HANDLE_RE = re.compile(r"^/([^/]+)")
+_ID_RE = re.compile(r"/status/(\d+)")
+
+# Walks tweet cards in-page (prefer tweet articles, fallback to cell containers) and
+# returns plain dicts, so extraction costs one CDP round-trip per page. Stops after
+# `max` complete cards instead of serializing everything loaded.
+_EXTRACT_JS = """
+({max, sel}) => {
+  let cards = document.querySelectorAll(sel.tweet);
+  if (!cards.length) cards = document.querySelectorAll(sel.cell);
+  const out = [];
+  for (const c of cards) {
+    if (out.length >= max) break;
+    const l = c.querySelector(sel.link);
+    const t = c.querySelector(sel.text);
+    const h = c.querySelector(sel.handle);
+    if (!l || !t || !h) continue;
+    out.push({
+      href: l.getAttribute('href'),
+      text: t.textContent,
+      handle: h.getAttribute('href'),
+      verified: !!c.querySelector(sel.verified),
+    });
+  }
+  return out;
+}
+"""
+
+
+_CARDS_READY_JS = "([sel, n]) => document.querySelectorAll(sel).length >= n"
+
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+MAX_CONTEXTS = 4
+_LAUNCH_ARGS = ['--disable-dev-shm-usage', '--no-sandbox']
+# Never read by the extractor; aborting them cuts page weight and time to domcontentloaded
+_BLOCKED_RESOURCES = frozenset({"image", "media", "font", "stylesheet"})
+
+# One chromium kept warm across search_posts calls. Async Playwright objects are bound
+# to the loop that created them, so the browser lives on a dedicated background loop
+# and every call (sync or async) is scheduled onto it; each call gets fresh contexts.
+_PW = None
+_BROWSER = None
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+_BROWSER_LOCK = asyncio.Lock()
+
+
+def _pool_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="orbit-browser", daemon=True).start()
+            _LOOP = loop
+            atexit.register(_shutdown)
+    return _LOOP
+
+
+async def _get_browser():
+    global _PW, _BROWSER
+    async with _BROWSER_LOCK:
+        if _BROWSER is None or not _BROWSER.is_connected():
+            if _PW is None:
+                _PW = await async_playwright().start()
+            _BROWSER = await _PW.chromium.launch(headless=True, args=_LAUNCH_ARGS)
+    return _BROWSER
+
+
+async def _close_browser() -> None:
+    global _PW, _BROWSER
+    if _BROWSER is not None:
+        await _BROWSER.close()
+        _BROWSER = None
+    if _PW is not None:
+        await _PW.stop()
+        _PW = None
+
+
+def _shutdown() -> None:
+    loop = _LOOP
+    if loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_browser(), loop).result(timeout=10)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+
+
+async def _block_heavy(route) -> None:
+    if route.request.resource_type in _BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
 
 
 def search_posts(topics: List[str], limit: int = 5) -> List[Dict[str, Any]]:
@@ -17,33 +129,60 @@ def search_posts(topics: List[str], limit: int = 5) -> List[Dict[str, Any]]:
     Returns:
         List of dictionaries containing tweet data
     """
-    all_posts = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
-        # Set user agent to avoid detection
-        page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
-        for topic in topics:
+    return asyncio.run_coroutine_threadsafe(_search_all(topics, limit), _pool_loop()).result()
+
+
+async def asearch_posts(topics: List[str], limit: int = 5) -> List[Dict[str, Any]]:
+    """Async search_posts, usable from any event loop."""
+    fut = asyncio.run_coroutine_threadsafe(_search_all(topics, limit), _pool_loop())
+    return await asyncio.wrap_future(fut)
+
+
+async def _search_all(topics: List[str], limit: int) -> List[Dict[str, Any]]:
+    """Topics run concurrently, one page per topic across up to MAX_CONTEXTS contexts."""
+    if not topics:
+        return []
+
+    browser = await _get_browser()
+    contexts: asyncio.Queue = asyncio.Queue()
+    opened = []
+    try:
+        for _ in range(min(len(topics), MAX_CONTEXTS)):
+            # Set user agent to avoid detection
+            ctx = await browser.new_context(user_agent=_USER_AGENT)
+            opened.append(ctx)
+            await ctx.route("**/*", _block_heavy)
+            contexts.put_nowait(ctx)
+
+        async def run(topic: str) -> List[Dict[str, Any]]:
+            ctx = await contexts.get()
             try:
-                posts = _search_topic(page, topic, limit)
-                all_posts.extend(posts)
+                page = await ctx.new_page()
+                try:
+                    return await _search_topic(page, topic, limit)
+                finally:
+                    await page.close()
             except Exception as e:
                 print(f"Error searching for topic '{topic}': {e}")
-                continue
-        
-        browser.close()
-    
+                return []
+            finally:
+                contexts.put_nowait(ctx)
+
+        # gather keeps topic order, so dedup still prefers earlier topics
+        per_topic = await asyncio.gather(*(run(t) for t in topics))
+    finally:
+        # contexts are cheap to close; the browser stays up for the next call
+        for ctx in opened:
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+
     # Filter and deduplicate posts
-    filtered_posts = _filter_posts(all_posts)
-    return _deduplicate_posts(filtered_posts)
+    return _select_posts(post for posts in per_topic for post in posts)
 
 
-def _search_topic(page: Page, topic: str, limit: int) -> List[Dict[str, Any]]:
+async def _search_topic(page: Page, topic: str, limit: int) -> List[Dict[str, Any]]:
     """Search for a specific topic on X."""
     # Construct search query (no live filter)
     query = f'{topic} -is:reply -is:retweet'
@@ -52,67 +191,59 @@ def _search_topic(page: Page, topic: str, limit: int) -> List[Dict[str, Any]]:
     
     try:
         # goto with small retry, wait for DOM only (no networkidle)
-        def navigate_and_prime(url: str):
+        async def navigate_and_prime(url: str):
             tries = 3
             for i in range(tries):
                 try:
-                    page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                    await page.goto(url, wait_until="domcontentloaded", timeout=60000)
                     break
                 except Exception:
                     if i == tries - 1:
                         raise
-                    time.sleep(1.5 + 0.5 * i)
-            # initial prime scrolls before waiting
+                    await asyncio.sleep(1.5 + 0.5 * i)
+            # prime scrolls, stopping as soon as enough cards have rendered
             for _ in range(3):
                 try:
-                    page.mouse.wheel(0, 1400)
+                    await page.mouse.wheel(0, 1400)
                 except Exception:
-                    page.evaluate("window.scrollBy(0, 1400)")
-                time.sleep(0.8)
+                    await page.evaluate("window.scrollBy(0, 1400)")
+                try:
+                    await page.wait_for_function(_CARDS_READY_JS, arg=[_SEL_TWEET, limit], timeout=800)
+                    break
+                except PlaywrightTimeoutError:
+                    continue
             # wait for any status link
-            page.wait_for_selector('a[href*="/status/"]', timeout=60000)
+            await page.wait_for_selector(_SEL_STATUS_LINK, timeout=60000)
 
         # try primary, then fallback domain
         try:
-            navigate_and_prime(search_url_primary)
+            await navigate_and_prime(search_url_primary)
         except Exception:
-            navigate_and_prime(search_url_fallback)
+            await navigate_and_prime(search_url_fallback)
 
-        # collect cards (prefer tweet articles, fallback to cell containers)
-        cards = page.query_selector_all('article[data-testid="tweet"]')
-        if not cards:
-            cards = page.query_selector_all('[data-testid="cellInnerDiv"]')
+        # collect up to `limit` cards in one in-page pass (one CDP round-trip instead of several per card)
+        rows = await page.evaluate(_EXTRACT_JS, {"max": limit, "sel": _SELECTORS})
         results = []
-        for c in cards[:30]:
-            try:
-                link = c.query_selector('a[href*="/status/"]')
-                text_el = c.query_selector('[data-testid="tweetText"]')
-                handle_el = c.query_selector('a[href^="/"][role="link"]')
-                if not (link and text_el and handle_el):
-                    continue
-
-                href = link.get_attribute("href") or ""  # /user/status/12345
-                tweet_id = href.split("/")[-1]
-                handle_href = handle_el.get_attribute("href") or "/"
-                handle = handle_href[1:].split("/")[0]
-                text_node = text_el.text_content() or ""
-                text_val = text_node.strip()
-                url = f"https://twitter.com/{handle}/status/{tweet_id}" if handle and tweet_id else ""
-                verified = c.query_selector('[data-testid="icon-verified"]') is not None
-
-                # Include both id and tweet_id for compatibility across callers
-                results.append({
-                    "id": tweet_id,
-                    "tweet_id": tweet_id,
-                    "handle": handle,
-                    "text": text_val,
-                    "url": url,
-                    "verified": verified,
-                    "followers": None,
-                })
-            except Exception as e:
-                print("Error extracting post:", e)
+        for row in rows:
+            id_m = _ID_RE.search(row.get("href") or "")  # /user/status/12345
+            handle_m = _HANDLE_RE.match(row.get("handle") or "")
+            if not (id_m and handle_m):
                 continue
+            tweet_id = id_m.group(1)
+            handle = handle_m.group(1)
+            text_val = (row.get("text") or "").strip()
+            url = f"https://twitter.com/{handle}/status/{tweet_id}" if handle and tweet_id else ""
+
+            # Include both id and tweet_id for compatibility across callers
+            results.append({
+                "id": tweet_id,
+                "tweet_id": tweet_id,
+                "handle": handle,
+                "text": text_val,
+                "url": url,
+                "verified": bool(row.get("verified")),
+                "followers": None,
+            })
 
         print(f"Extracted {len(results)} posts for topic {topic}")
         return results[:limit]
@@ -122,129 +253,39 @@ def _search_topic(page: Page, topic: str, limit: int) -> List[Dict[str, Any]]:
         return []
 
 
-def _extract_posts_from_page(page: Page) -> List[Dict[str, Any]]:
-    """Extract post data from the current page."""
-    posts = []
-    
-    try:
-        # Wait for tweets to load
-        page.wait_for_selector('[data-testid="tweet"]', timeout=10000)
-        
-        # Get all tweet elements
-        tweet_elements = page.query_selector_all('[data-testid="tweet"]')
-        
-        for tweet_element in tweet_elements:
-            try:
-                post_data = _extract_tweet_data(tweet_element)
-                if post_data:
-                    posts.append(post_data)
-            except Exception as e:
-                print(f"Error extracting tweet data: {e}")
-                continue
-                
-    except Exception as e:
-        print(f"Error extracting posts: {e}")
-    
-    return posts
-
-
-def _extract_tweet_data(tweet_element) -> Dict[str, Any]:
-    """Extract data from a single tweet element."""
-    try:
-        # Extract tweet ID from URL
-        tweet_link = tweet_element.query_selector('a[href*="/status/"]')
-        tweet_url = tweet_link.get_attribute('href') if tweet_link else ""
-        tweet_id = tweet_url.split('/')[-1] if tweet_url else ""
-        
-        # Extract author information
-        author_element = tweet_element.query_selector('[data-testid="User-Name"]')
-        if not author_element:
-            return None
-            
-        author_name = author_element.text_content().strip() if author_element else ""
-        
-        # Extract handle
-        handle_element = tweet_element.query_selector('[data-testid="User-Name"] a')
-        handle = ""
-        if handle_element:
-            handle_url = handle_element.get_attribute('href')
-            if handle_url:
-                handle = handle_url.replace('/', '').replace('@', '')
-        
-        # Check if verified
-        verified = tweet_element.query_selector('[data-testid="icon-verified"]') is not None
-        
-        # Extract tweet text
-        text_element = tweet_element.query_selector('[data-testid="tweetText"]')
-        text = text_element.text_content().strip() if text_element else ""
-        
-        # Extract follower count (this is challenging with X's current structure)
-        # We'll try to get it from the user profile link
-        followers = 0
-        try:
-            # This is a simplified approach - in practice, you might need to visit profile pages
-            # or use a different method to get accurate follower counts
-            user_link = tweet_element.query_selector('[data-testid="User-Name"] a')
-            if user_link:
-                # For now, we'll set a default value and rely on other filters
-                followers = 1000  # Placeholder
-        except:
-            followers = 0
-        
-        return {
-            'tweet_id': tweet_id,
-            'author': author_name,
-            'handle': handle,
-            'text': text,
-            'url': f"https://twitter.com/{handle}/status/{tweet_id}" if handle and tweet_id else "",
-            'verified': verified,
-            'followers': followers
-        }
-        
-    except Exception as e:
-        print(f"Error extracting tweet data: {e}")
-        return None
-
-
-def _filter_posts(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Filter posts based on verification, followers, and allowlist."""
-    filtered_posts = []
+def _select_posts(posts: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Filter posts based on verification, followers, and allowlist, keeping the
+    first occurrence of each tweet_id, in a single pass."""
     allowlist = _get_allowlist()
-    
+    seen_ids = set()
+    selected = []
+
     for post in posts:
-        if not post or not post.get('tweet_id'):
+        tweet_id = post.get('tweet_id') if post else None
+        if not tweet_id or tweet_id in seen_ids:
             continue
 
         # Temporarily allow only verified or allowlisted; ignore follower threshold placeholder
         is_verified = post.get('verified', False)
-        is_allowlisted = post.get('handle', '').lower() in allowlist
+        handle = (post.get('handle') or '').lower()
+        is_allowlisted = handle in allowlist
 
         if is_verified or is_allowlisted:
-            filtered_posts.append(post)
-    
-    return filtered_posts
+            seen_ids.add(tweet_id)
+            selected.append(post)
 
+    return selected
 
-def _get_allowlist() -> List[str]:
-    """Get allowlist from environment variable."""
-    allowlist_str = os.getenv('ALLOWLIST', '')
-    if allowlist_str:
-        return [handle.strip().lower().replace('@', '') for handle in allowlist_str.split(',')]
-    return []
 
+@functools.lru_cache(maxsize=1)
+def _get_allowlist() -> FrozenSet[str]:
+    """Get allowlist from the ALLOWLIST environment variable.
 
-def _deduplicate_posts(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Remove duplicate posts based on tweet_id."""
-    seen_ids = set()
-    unique_posts = []
-    
-    for post in posts:
-        tweet_id = post.get('tweet_id')
-        if tweet_id and tweet_id not in seen_ids:
-            seen_ids.add(tweet_id)
-            unique_posts.append(post)
-    
-    return unique_posts
+    Memoized: the first call freezes the value, so code that changes ALLOWLIST
+    afterwards must call _get_allowlist.cache_clear().
+    """
+    allowlist_str = os.getenv('ALLOWLIST', '')
+    return frozenset(h.strip().lower().lstrip('@') for h in allowlist_str.split(',') if h.strip())
 
 
 # Example usage
@@ -254,6 +295,7 @@ if __name__ == "__main__":
     
     # Set environment variable for testing
     os.environ['ALLOWLIST'] = 'elonmusk,vitalikbuterin'
+    _get_allowlist.cache_clear()
     
     # Search for posts
     results = search_posts(topics, limit=3)
@@ -0,0 +1,110 @@
+"""
+Approval-flow state for telegram_processor.
+Replied tweet IDs and pending drafts live in one sqlite file keyed by tweet_id, so
+membership checks are primary-key lookups and each write is a single statement
+instead of a rewrite of a growing JSON file.
+"""
+import os
+import time
+import sqlite3
+import orjson
+from typing import Optional, Dict, Any, Iterable, Set
+
+STATE_DB = "state.db"
+LEGACY_PENDING_FILE = "pending_approvals.json"
+LEGACY_REPLIED_FILE = "replied_tweets.json"
+
+_db: Optional[sqlite3.Connection] = None
+
+
+def _load_legacy(path: str) -> list:
+    try:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return []
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """One-time import of the old JSON stores into a fresh database."""
+    replied = _load_legacy(LEGACY_REPLIED_FILE)
+    pending = _load_legacy(LEGACY_PENDING_FILE)
+    if not (replied or pending):
+        return
+    with conn:
+        conn.execute("BEGIN")
+        conn.executemany("INSERT OR IGNORE INTO replied (tweet_id) VALUES (?)", ((str(t),) for t in replied))
+        for draft in pending:
+            _insert_pending(conn, draft)
+
+
+def _conn() -> sqlite3.Connection:
+    global _db
+    if _db is None:
+        fresh = not os.path.exists(STATE_DB)
+        _db = sqlite3.connect(STATE_DB, isolation_level=None)
+        _db.execute("CREATE TABLE IF NOT EXISTS replied (tweet_id TEXT PRIMARY KEY)")
+        _db.execute("CREATE TABLE IF NOT EXISTS pending (tweet_id TEXT PRIMARY KEY, data TEXT, created REAL)")
+        if fresh:
+            _migrate(_db)
+    return _db
+
+
+def _insert_pending(conn: sqlite3.Connection, draft: Dict[str, Any]) -> None:
+    created = draft.get("approved_at") or draft.get("created_at") or time.time()
+    conn.execute(
+        "INSERT OR REPLACE INTO pending (tweet_id, data, created) VALUES (?, ?, ?)",
+        (str(draft["tweet_id"]), orjson.dumps(draft), created),
+    )
+
+
+def is_replied(tweet_id: str) -> bool:
+    return _conn().execute("SELECT 1 FROM replied WHERE tweet_id = ?", (str(tweet_id),)).fetchone() is not None
+
+
+def add_replied(tweet_id: str) -> None:
+    """Mark a tweet replied and drop any pending draft for it."""
+    conn = _conn()
+    with conn:
+        conn.execute("BEGIN")
+        conn.execute("INSERT OR IGNORE INTO replied (tweet_id) VALUES (?)", (str(tweet_id),))
+        conn.execute("DELETE FROM pending WHERE tweet_id = ?", (str(tweet_id),))
+
+
+def count_replied() -> int:
+    return _conn().execute("SELECT COUNT(*) FROM replied").fetchone()[0]
+
+
+def is_pending(tweet_id: str) -> bool:
+    return _conn().execute("SELECT 1 FROM pending WHERE tweet_id = ?", (str(tweet_id),)).fetchone() is not None
+
+
+def add_pending(draft: Dict[str, Any]) -> None:
+    _insert_pending(_conn(), draft)
+
+
+def processed_among(tweet_ids: Iterable[str]) -> Set[str]:
+    """Subset of `tweet_ids` already replied to or pending, in one query per 500 IDs."""
+    ids = list({str(t) for t in tweet_ids if t})
+    found: Set[str] = set()
+    conn = _conn()
+    for i in range(0, len(ids), 500):  # stay under SQLITE_MAX_VARIABLE_NUMBER
+        chunk = ids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        found.update(r[0] for r in conn.execute(
+            f"SELECT tweet_id FROM replied WHERE tweet_id IN ({marks}) "
+            f"UNION SELECT tweet_id FROM pending WHERE tweet_id IN ({marks})",
+            chunk + chunk,
+        ))
+    return found
+
+
+def count_pending() -> int:
+    return _conn().execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+
+
+def next_pending() -> Optional[Dict[str, Any]]:
+    """Oldest pending draft, left in place until it is posted."""
+    row = _conn().execute("SELECT data FROM pending ORDER BY created LIMIT 1").fetchone()
+    return orjson.loads(row[0]) if row else None
+
@@ -1,11 +1,15 @@
-import os, re, json, asyncio, time
+import os, json, asyncio, time
+try:
+    import re2 as re  # optional: linear-time DFA matching, same API for this pattern
+except ImportError:
+    import re
 from dotenv import load_dotenv
 from telegram import Bot
 from requests.exceptions import RequestException
 from src.reply_writer import write_reply
 from src.x_fetch import get_tweet_text
 from src.poster import post_tweet
-from src.telegram_bot import send_drafts_async
+from src.telegram_bot import send_drafts_async, ALLOWED_UPDATES
 
 load_dotenv()
 TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -19,20 +23,42 @@ X_STATUS_RE = re.compile(r"(?:https?://)?(?:x|twitter)\.com/[^/]+/status/(\d+)")
 def _load_offset():
     if os.path.exists(OFFSET_FILE):
         try:
-            return json.load(open(OFFSET_FILE)).get("offset")
+            with open(OFFSET_FILE) as f:
+                return json.load(f).get("offset")
         except Exception:
             return None
     return None
 
 
 def _save_offset(offset):
+    # tmp + fsync + rename: a torn offset file would make the next run replay every message
+    tmp = OFFSET_FILE + ".tmp"
     try:
-        json.dump({"offset": offset}, open(OFFSET_FILE, "w"))
+        with open(tmp, "w") as f:
+            json.dump({"offset": offset}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, OFFSET_FILE)
     except Exception:
         pass
 
 
-async def _process_text(msg_text: str):
+def _notify(text: str) -> asyncio.Task:
+    """Schedule a chat confirmation without waiting on its round-trip."""
+    return asyncio.create_task(bot.send_message(chat_id=CHAT_ID, text=text))
+
+
+async def _post_and_confirm(text: str, ok_text: str, in_reply_to=None) -> asyncio.Task:
+    try:
+        # post_tweet is blocking requests I/O; keep it off the event loop
+        await asyncio.to_thread(post_tweet, text, in_reply_to=in_reply_to)
+    except RequestException as e:
+        return _notify(f"❌ Post failed: {e}")
+    return _notify(ok_text)
+
+
+async def _process_text(msg_text: str) -> asyncio.Task:
+    """Handle one message; returns the pending confirmation send for the caller to await."""
     m = X_STATUS_RE.search(msg_text or "")
     if m:
         tweet_id = m.group(1)
@@ -45,13 +71,8 @@ async def _process_text(msg_text: str):
             {"tweet_id": tweet_id, "author": "manual", "text": draft}
         ])
         if approved.get("action") == "approve":
-            try:
-                resp = post_tweet(approved["text"], in_reply_to=tweet_id)
-                await bot.send_message(chat_id=CHAT_ID, text=f"✅ Replied to tweet {tweet_id}")
-            except RequestException as e:
-                await bot.send_message(chat_id=CHAT_ID, text=f"❌ Post failed: {e}")
-        else:
-            await bot.send_message(chat_id=CHAT_ID, text="⏭️ Skipped.")
+            return await _post_and_confirm(approved["text"], f"✅ Replied to tweet {tweet_id}", in_reply_to=tweet_id)
+        return _notify("⏭️ Skipped.")
     else:
         # Plain text → compose an original tweet
         draft = write_reply(msg_text)
@@ -59,29 +80,27 @@ async def _process_text(msg_text: str):
             {"tweet_id": None, "author": "self", "text": draft}
         ])
         if approved.get("action") == "approve":
-            try:
-                resp = post_tweet(approved["text"]) 
-                await bot.send_message(chat_id=CHAT_ID, text=f"✅ Posted original tweet.")
-            except RequestException as e:
-                await bot.send_message(chat_id=CHAT_ID, text=f"❌ Post failed: {e}")
-        else:
-            await bot.send_message(chat_id=CHAT_ID, text="⏭️ Skipped.")
+            return await _post_and_confirm(approved["text"], "✅ Posted original tweet.")
+        return _notify("⏭️ Skipped.")
 
 
 async def run_telegram_router_once():
     """Polls Telegram once, processes any new messages from CHAT_ID, updates offset, then returns."""
     offset = _load_offset()
-    updates = await bot.get_updates(offset=offset, timeout=10)
+    updates = await bot.get_updates(offset=offset, timeout=10, allowed_updates=ALLOWED_UPDATES)
     if not updates:
         return
     new_offset = offset
+    confirmations = []
     for upd in updates:
         new_offset = max(new_offset or 0, upd.update_id + 1)
         msg = getattr(upd, "message", None)
         if not msg or msg.chat.id != CHAT_ID:
             continue
         if msg.text:
-            await _process_text(msg.text)
+            confirmations.append(await _process_text(msg.text))
+    # Confirmations overlap with the next message's work; flush them before returning
+    await asyncio.gather(*confirmations, return_exceptions=True)
     if new_offset is not None:
         _save_offset(new_offset)
 
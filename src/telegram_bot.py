@@ -1,4 +1,5 @@
 import os, asyncio, time
+import requests
 from dotenv import load_dotenv
 from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
 
@@ -6,15 +7,20 @@ load_dotenv()
 TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 CHAT_ID = int(os.getenv("TELEGRAM_CHAT_ID"))
 bot = Bot(token=TOKEN)
+_SESSION = requests.Session()  # keep-alive across bursts of notify_error calls
+
+# Telegram stores allowed_updates per bot token and reuses it for every later
+# getUpdates that omits it, so every poller passes the full set explicitly.
+ALLOWED_UPDATES = ["message", "callback_query"]
 
 async def send_ping(text: str):
     await bot.send_message(chat_id=CHAT_ID, text=text)
     print("Message sent successfully:", text)
 
 async def send_drafts_async(drafts: list[dict]) -> dict:
-    text = "🚀 *ORBIT Agent Drafts*\n\n"
-    for d in drafts:
-        text += f"• `{d['tweet_id']}` — {d['text']}\n"
+    lines = ["🚀 *ORBIT Agent Drafts*\n\n"]
+    lines.extend(f"• `{d['tweet_id']}` — {d['text']}\n" for d in drafts)
+    text = "".join(lines)
     keyboard = [
         [InlineKeyboardButton("Approve ✅", callback_data=f"approve:{drafts[0]['tweet_id']}"),
          InlineKeyboardButton("Skip ❌", callback_data=f"skip:{drafts[0]['tweet_id']}")]
@@ -24,10 +30,12 @@ async def send_drafts_async(drafts: list[dict]) -> dict:
     msg = await bot.send_message(chat_id=CHAT_ID, text=text, parse_mode="Markdown", reply_markup=reply_markup)
 
     print("Waiting for approval in Telegram...")
-    start = time.time()
+    deadline = time.monotonic() + 60
     offset = None
-    while time.time() - start < 60:
-        updates = await bot.get_updates(offset=offset, timeout=10)
+    # One long-poll per wait: Telegram holds the request open until a click arrives
+    # (or the window closes), so there are no idle round-trips or sleeps.
+    while (remaining := int(deadline - time.monotonic())) > 0:
+        updates = await bot.get_updates(offset=offset, timeout=remaining, allowed_updates=ALLOWED_UPDATES)
         for upd in updates:
             offset = upd.update_id + 1
             if upd.callback_query and upd.callback_query.message.message_id == msg.message_id:
@@ -37,7 +45,6 @@ async def send_drafts_async(drafts: list[dict]) -> dict:
                     return {"action": "approve", "tweet_id": data.split(":")[1], "text": drafts[0]["text"]}
                 elif data.startswith("skip"):
                     return {"action": "skip"}
-        await asyncio.sleep(2)
     return {"action": "timeout"}
 
 def send_drafts(drafts: list[dict]) -> dict:
@@ -49,10 +56,11 @@ def notify_error(text: str) -> None:
     """Send a concise error notification to the configured Telegram chat."""
     msg = f"❌ ORBIT error: {text}"
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        async def _send():
-            await bot.send_message(chat_id=CHAT_ID, text=msg[:4000])
-        loop.run_until_complete(_send())
+        # Plain Bot API POST: no event loop to spin up, and safe inside a running one
+        _SESSION.post(
+            f"https://api.telegram.org/bot{TOKEN}/sendMessage",
+            json={"chat_id": CHAT_ID, "text": msg[:4000]},
+            timeout=5,
+        )
     except Exception:
-        pass
\ No newline at end of file
+        pass
@@ -5,58 +5,43 @@ Handles the two-phase approval process:
 2. Check approved drafts and post them
 """
 import os
-import json
 import time
+import asyncio
+import contextlib
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 
-# Import modules
-from src.scraper import search_posts  
+# Import modules (Playwright and Telegram are imported where used: neither
+# phase needs both, and they dominate cold start)
 from src.x_search import search_recent_topics
-from src.telegram_bot import send_drafts, notify_error
 from src.poster import post_tweet
+from src import state
 
 load_dotenv()
 
-PENDING_FILE = "pending_approvals.json"
-REPLIED_FILE = "replied_tweets.json"
 
+async def _find_posts(topics: List[str]) -> List[Dict[str, Any]]:
+    """API search first, with the Playwright fallback already warming up behind it."""
+    from src.scraper import asearch_posts
 
-def load_pending() -> List[Dict]:
-    """Load pending approvals from file."""
+    scrape_task = asyncio.create_task(asearch_posts(topics, limit=3))
     try:
-        with open(PENDING_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
-
-
-def save_pending(pending: List[Dict]) -> None:
-    """Save pending approvals to file."""
-    with open(PENDING_FILE, 'w') as f:
-        json.dump(pending, f, indent=2)
-
-
-def load_replied() -> List[str]:
-    """Load replied tweet IDs from file."""
-    try:
-        with open(REPLIED_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
-
-
-def save_replied(tweet_id: str) -> None:
-    """Add tweet ID to replied list."""
-    replied = load_replied()
-    if tweet_id not in replied:
-        replied.append(tweet_id)
-        with open(REPLIED_FILE, 'w') as f:
-            json.dump(replied, f, indent=2)
+        posts = await asyncio.to_thread(search_recent_topics, topics, limit_per_topic=2)
+        if not posts:
+            return await scrape_task
+        return posts
+    finally:
+        # API had results (or failed): drop the scrape instead of finishing it
+        if not scrape_task.done():
+            scrape_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await scrape_task
 
 
 def process_new_messages():
     """Phase 1: Generate drafts for new messages and save for approval."""
+    from src.telegram_bot import send_drafts, notify_error
+
     print("🔍 Phase 1: Processing new messages...")
     
     # Get topics from environment
@@ -66,9 +51,7 @@ def process_new_messages():
     
     # Search for posts
     try:
-        posts = search_recent_topics(topics, limit_per_topic=2)
-        if not posts:
-            posts = search_posts(topics, limit=3)
+        posts = asyncio.run(_find_posts(topics))
         print(f"✅ Found {len(posts)} posts")
         
         if not posts:
@@ -80,25 +63,27 @@ def process_new_messages():
         notify_error(f"Search failure: {e}")
         return
     
-    # Load existing data
-    replied_ids = load_replied()
-    pending = load_pending()
-    
-    print(f"📝 Already replied to {len(replied_ids)} tweets")
-    print(f"📝 {len(pending)} pending approvals")
+    print(f"📝 Already replied to {state.count_replied()} tweets")
+    print(f"📝 {state.count_pending()} pending approvals")
     
+    # Resolve replied/pending membership for the whole batch once
+    processed = state.processed_among(p.get('tweet_id') for p in posts)
+
+    # Imported once here rather than at module top: it pulls in openai/numpy, which
+    # the posting phase never needs
+    from src.reply_writer import write_reply
+
     # Generate new candidates
     new_candidates = []
     for post in posts:
         tweet_id = post.get('tweet_id')
         
         # Skip if already replied or pending
-        if tweet_id in replied_ids or any(p['tweet_id'] == tweet_id for p in pending):
+        if tweet_id in processed:
             print(f"⏭️ Skipping {tweet_id} (already processed)")
             continue
             
         try:
-            from src.reply_writer import write_reply
             reply_text = write_reply(post.get('text', ''))
             
             candidate = {
@@ -136,8 +121,7 @@ def process_new_messages():
                 "url": new_candidates[0]["url"],
                 "approved_at": time.time()
             }
-            pending.append(approved_draft)
-            save_pending(pending)
+            state.add_pending(approved_draft)
             print(f"✅ Approved draft saved for next run")
         else:
             print("⏭️ Draft not approved, skipping")
@@ -149,36 +133,34 @@ def process_new_messages():
 
 def process_approved_drafts():
     """Phase 2: Check approved drafts and post them."""
+    from src.telegram_bot import notify_error
+
     print("🚀 Phase 2: Processing approved drafts...")
     
-    pending = load_pending()
-    if not pending:
+    draft = state.next_pending()  # Process one at a time
+    if draft is None:
         print("📭 No pending approvals")
         return
     
-    print(f"📋 Found {len(pending)} pending approvals")
+    print(f"📋 Found {state.count_pending()} pending approvals")
     
-    for draft in pending[:1]:  # Process one at a time
-        try:
-            print(f"📤 Posting approved draft for @{draft['author']}")
-            print(f"   Original: {draft['original_text'][:100]}...")
-            print(f"   Reply: {draft['text']}")
-            
-            resp = post_tweet(draft['text'], in_reply_to=draft['tweet_id'])
-            print(f"✅ Posted successfully: {resp}")
-            
-            # Mark as replied and remove from pending
-            save_replied(draft['tweet_id'])
-            pending.remove(draft)
-            save_pending(pending)
-            
-            # Notify success
-            notify_error(f"✅ Posted reply to @{draft['author']}")
-            
-        except Exception as e:
-            print(f"❌ Error posting draft: {e}")
-            notify_error(f"Post failure: {e}")
-            continue
+    try:
+        print(f"📤 Posting approved draft for @{draft['author']}")
+        print(f"   Original: {draft['original_text'][:100]}...")
+        print(f"   Reply: {draft['text']}")
+        
+        resp = post_tweet(draft['text'], in_reply_to=draft['tweet_id'])
+        print(f"✅ Posted successfully: {resp}")
+        
+        # Mark as replied and remove from pending
+        state.add_replied(draft['tweet_id'])
+        
+        # Notify success
+        notify_error(f"✅ Posted reply to @{draft['author']}")
+        
+    except Exception as e:
+        print(f"❌ Error posting draft: {e}")
+        notify_error(f"Post failure: {e}")
 
 
 def main():
@@ -186,9 +168,9 @@ def main():
     print("🚀 ORBIT Telegram Processor starting...")
     
     # Phase 1: Process approved drafts first
-    pending = load_pending()
+    pending = state.count_pending()
     if pending:
-        print(f"📋 Phase 1: Found {len(pending)} pending approvals, processing...")
+        print(f"📋 Phase 1: Found {pending} pending approvals, processing...")
         process_approved_drafts()
     else:
         print("📭 Phase 1: No pending approvals")
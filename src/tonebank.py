@@ -23,7 +23,10 @@ TONE_BANK = {
     ],
 }
 
+# Frozen once at import: pick a tone, then a phrase, without rebuilding lists per call
+_TONES = tuple(TONE_BANK)
+_BY_TONE = {tone: tuple(phrases) for tone, phrases in TONE_BANK.items()}
+
 def generate_reply(post_text: str) -> str:
     """Return a one-line ORBIT-style response."""
-    tone = random.choice(list(TONE_BANK.keys()))
-    return random.choice(TONE_BANK[tone])
\ No newline at end of file
+    return random.choice(_BY_TONE[random.choice(_TONES)])
\ No newline at end of file
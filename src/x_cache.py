@@ -0,0 +1,65 @@
+"""
+Short-lived on-disk cache for X API GET responses.
+Keyed by URL + sorted params, so repeat searches and tweet lookups inside the TTL
+(dev loops, test scripts, retried runs) cost no quota. Set X_CACHE_DISABLE=1 to bypass.
+"""
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional, Dict, Any
+
+import orjson
+
+CACHE_PATH = os.getenv("X_CACHE_PATH", ".cache/x_api.db")
+DEFAULT_TTL = 300
+
+_db: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.getenv("X_CACHE_DISABLE", "").lower() not in ("1", "true", "yes")
+
+
+def cache_key(url: str, params: Dict[str, Any]) -> str:
+    payload = orjson.dumps([url, sorted((str(k), str(v)) for k, v in params.items())])
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _conn() -> sqlite3.Connection:
+    global _db
+    if _db is None:
+        d = os.path.dirname(CACHE_PATH)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        # shared by the search worker threads; every access holds _lock
+        _db = sqlite3.connect(CACHE_PATH, isolation_level=None, check_same_thread=False)
+        _db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body BLOB, expires REAL)")
+    return _db
+
+
+def get(key: str) -> Optional[Any]:
+    """Cached JSON body for `key`, or None if missing, expired or disabled."""
+    if not enabled():
+        return None
+    with _lock:
+        row = _conn().execute("SELECT body, expires FROM responses WHERE key = ?", (key,)).fetchone()
+    if row is None or row[1] < time.time():
+        return None
+    return orjson.loads(row[0])
+
+
+def put(key: str, body: bytes, ttl: float = DEFAULT_TTL) -> None:
+    """Store a raw JSON response body for `ttl` seconds."""
+    if not enabled():
+        return
+    with _lock:
+        conn = _conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, expires) VALUES (?, ?, ?)",
+            (key, body, now + ttl),
+        )
+        conn.execute("DELETE FROM responses WHERE expires < ?", (now,))
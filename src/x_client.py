@@ -0,0 +1,56 @@
+"""
+Async HTTP client for the X API.
+One HTTP/2 httpx pool, so concurrent searches and tweet lookups multiplex over a
+single TLS connection; requests are OAuth1-signed with the same credentials as
+the requests-based path.
+"""
+import atexit
+import asyncio
+from typing import Optional
+
+import httpx
+from requests_oauthlib import OAuth1
+
+_http: Optional[httpx.AsyncClient] = None
+_http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class OAuth1Auth(httpx.Auth):
+    """httpx adapter for a requests_oauthlib OAuth1 signer (query params are signed from the URL)."""
+
+    def __init__(self, oauth1: OAuth1):
+        self._client = oauth1.client
+
+    def auth_flow(self, request: httpx.Request):
+        _, headers, _ = self._client.sign(str(request.url), http_method=request.method)
+        # requests_oauthlib configures its client to return byte-string headers
+        value = headers.get("Authorization") or headers[b"Authorization"]
+        request.headers["Authorization"] = value.decode() if isinstance(value, bytes) else value
+        yield request
+
+
+def get_client() -> httpx.AsyncClient:
+    """Shared AsyncClient for the running loop, created on first use.
+
+    httpx pools are bound to the loop they were opened on, so a new loop (e.g. a
+    second asyncio.run) gets a fresh client.
+    """
+    global _http, _http_loop
+    loop = asyncio.get_running_loop()
+    if _http is None or _http_loop is not loop:
+        if _http is None:
+            atexit.register(_close_http)
+        _http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+            timeout=20.0,
+        )
+        _http_loop = loop
+    return _http
+
+
+def _close_http() -> None:
+    try:
+        asyncio.run(_http.aclose())
+    except Exception:
+        pass
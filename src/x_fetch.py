@@ -1,7 +1,18 @@
 import os, requests
+import asyncio
+import functools
+import orjson
+from collections import OrderedDict
+from typing import Dict, List
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth1
+from src import x_cache, x_client
 
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
+
+@functools.lru_cache(maxsize=1)
 def _auth():
     return OAuth1(
         os.getenv("API_KEY"),
@@ -11,11 +22,97 @@ def _auth():
     )
 
 
+TWEETS_PER_LOOKUP = 100  # /2/tweets?ids= accepts up to 100 IDs
+TEXT_CACHE_SIZE = 1024
+
+# Tweet text is immutable, so found texts are kept; misses are retried next time
+_TEXT_CACHE: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _remember(tweet_id: str, text: str) -> None:
+    _TEXT_CACHE[tweet_id] = text
+    _TEXT_CACHE.move_to_end(tweet_id)
+    if len(_TEXT_CACHE) > TEXT_CACHE_SIZE:
+        _TEXT_CACHE.popitem(last=False)
+
+
+LOOKUP_URL = "https://api.twitter.com/2/tweets"
+
+
+def _plan(tweet_ids: List[str]):
+    """Split IDs into cached texts and lookup params (one set per 100 uncached IDs)."""
+    ids = list(dict.fromkeys(str(t) for t in tweet_ids if t))
+    texts: Dict[str, str] = {}
+    todo = []
+    for tid in ids:
+        if tid in _TEXT_CACHE:
+            _TEXT_CACHE.move_to_end(tid)
+            texts[tid] = _TEXT_CACHE[tid]
+        else:
+            todo.append(tid)
+    chunks = [
+        {"ids": ",".join(todo[i:i + TWEETS_PER_LOOKUP]), "tweet.fields": "text,lang,conversation_id"}
+        for i in range(0, len(todo), TWEETS_PER_LOOKUP)
+    ]
+    return texts, chunks
+
+
+def _absorb(body: Dict, texts: Dict[str, str]) -> None:
+    for t in body.get("data") or []:
+        tid = t.get("id")
+        if tid:
+            texts[tid] = (t.get("text") or "")[:1000]
+            _remember(tid, texts[tid])
+
+
+def _body(r, key: str):
+    if r.status_code != 200:
+        return None
+    x_cache.put(key, r.content)
+    return orjson.loads(r.content)
+
+
+def get_tweet_texts(tweet_ids: List[str]) -> Dict[str, str]:
+    """Return {tweet_id: text} for the tweets found, one request per 100 uncached IDs."""
+    texts, chunks = _plan(tweet_ids)
+    for params in chunks:
+        key = x_cache.cache_key(LOOKUP_URL, params)
+        body = x_cache.get(key)
+        if body is None:
+            body = _body(_SESSION.get(LOOKUP_URL, auth=_auth(), params=params, timeout=15), key)
+        if body is not None:
+            _absorb(body, texts)
+    return texts
+
+
+@functools.lru_cache(maxsize=1)
+def _async_auth() -> x_client.OAuth1Auth:
+    return x_client.OAuth1Auth(_auth())
+
+
+async def _aget_chunk(params: Dict):
+    key = x_cache.cache_key(LOOKUP_URL, params)
+    body = x_cache.get(key)
+    if body is None:
+        r = await x_client.get_client().get(LOOKUP_URL, params=params, auth=_async_auth(), timeout=15)
+        body = _body(r, key)
+    return body
+
+
+async def aget_tweet_texts(tweet_ids: List[str]) -> Dict[str, str]:
+    """Async get_tweet_texts; the 100-ID chunks are fetched concurrently."""
+    texts, chunks = _plan(tweet_ids)
+    for body in await asyncio.gather(*(_aget_chunk(params) for params in chunks)):
+        if body is not None:
+            _absorb(body, texts)
+    return texts
+
+
 def get_tweet_text(tweet_id: str) -> str:
     """Return the tweet text ('' if not found)."""
-    url = f"https://api.twitter.com/2/tweets/{tweet_id}"
-    params = {"tweet.fields": "text,lang,conversation_id"}
-    r = requests.get(url, auth=_auth(), params=params, timeout=15)
-    if r.status_code == 200 and r.json().get("data"):
-        return (r.json()["data"].get("text") or "")[:1000]
-    return ""
+    return get_tweet_texts([tweet_id]).get(str(tweet_id), "")
+
+
+async def aget_tweet_text(tweet_id: str) -> str:
+    """Async get_tweet_text."""
+    return (await aget_tweet_texts([tweet_id])).get(str(tweet_id), "")
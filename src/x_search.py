@@ -1,13 +1,30 @@
 import os
 import requests
-from typing import List, Dict
-from datetime import datetime, timezone, timedelta
+from typing import List, Dict, Optional, Iterator
 import time
+import random
+import asyncio
+import functools
+import itertools
+import threading
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import httpx
+import orjson
 from requests_oauthlib import OAuth1
+from src import x_cache, x_client
 
+# Shared keep-alive pool: per-topic workers reuse TLS connections instead of
+# handshaking on every search.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
+
+@functools.lru_cache(maxsize=1)
 def _auth() -> OAuth1:
-    """Create OAuth1 authentication object. Validates credentials are present."""
+    """Create OAuth1 authentication object, once. Validates credentials are present
+    (a failed check raises and is not cached)."""
     api_key = os.getenv("API_KEY")
     api_key_secret = os.getenv("API_KEY_SECRET")
     access_token = os.getenv("X_ACCESS_TOKEN")
@@ -33,108 +50,423 @@ def _auth() -> OAuth1:
     return OAuth1(api_key, api_key_secret, access_token, access_secret)
 
 
-def search_recent_for_topic(topic: str, limit: int = 5) -> List[Dict]:
-    """Search recent tweets for a topic using X API v2. Returns standardized posts."""
-    base = "https://api.twitter.com/2/tweets/search/recent"
-    # Build query similar to UI query
-    query = f"{topic} -is:reply -is:retweet"
-    params = {
-        "query": query,
-        "max_results": str(max(10, min(100, limit * 3))),  # overfetch a bit
-        "tweet.fields": "author_id,text,created_at,public_metrics",
-        "expansions": "author_id",
-        "user.fields": "username,verified,public_metrics",
-    }
-    for i in range(3):
-        r = requests.get(base, auth=_auth(), params=params, timeout=20)
-        if r.status_code != 429:
-            break
-        print(f"⚠️  Rate limited (429), retrying in {2 * (i + 1)}s...")
-        time.sleep(2 * (i + 1))
-    
+# Shared read-only default for missing nested objects in responses, so the
+# per-tweet lookups don't allocate a fresh {} each time
+_EMPTY = MappingProxyType({})
+
+SEARCH_RECENT_URL = "https://api.twitter.com/2/tweets/search/recent"
+MAX_QUERY_LEN = 512  # search/recent query limit on self-serve access levels
+MAX_COMBINED_PAGES = 3
+SEARCH_WORKERS = 4  # concurrent per-topic searches; more just bunches requests into 429s
+MAX_RATE_WAIT = float(os.getenv("X_MAX_RATE_WAIT", "60"))  # longest pause before giving up on a window
+BACKOFF_BASE = 2.0  # seconds; first-retry ceiling when a 429 carries no reset info
+RETRY_STATUSES = frozenset((429, 502, 503, 504))  # retried once; anything else is final
+
+
+class XRateLimiter:
+    """Paces calls from the x-rate-limit-remaining / x-rate-limit-reset response headers.
+
+    While plenty of quota is left calls go straight through; once it drops to
+    LOW_WATER the rest of the window is spread evenly, and an exhausted window
+    waits for the reset instead of spending a request on a 429.
+    """
+
+    LOW_WATER = 10
+
+    def __init__(self):
+        self.remaining: Optional[int] = None
+        self.reset_ts = 0.0
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """Reserve a slot and return how long to wait before using it."""
+        with self._lock:
+            now = time.time()
+            if self.remaining is None or now >= self.reset_ts:
+                return 0.0
+            window = self.reset_ts - now
+            if self.remaining <= 0:
+                return window
+            self.remaining -= 1
+            if self.remaining >= self.LOW_WATER:
+                return 0.0
+            return window / (self.remaining + 1)
+
+    def acquire(self) -> None:
+        wait = self.delay()
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, headers) -> None:
+        try:
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset_ts = float(headers["x-rate-limit-reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self.remaining, self.reset_ts = remaining, reset_ts
+
+
+_SEARCH_LIMITER = XRateLimiter()
+
+
+def _backoff(r, attempt: int) -> float:
+    """Seconds to wait before retrying a 429 or transient 5xx.
+
+    Honors Retry-After or x-rate-limit-reset, plus up to a second of jitter so
+    concurrent workers don't all retry on the same tick; without either header,
+    full-jitter exponential backoff capped at 30s. A 429 while the endpoint
+    window still has quota left (x-rate-limit-remaining > 0) is a transient
+    throttle, so that skips the reset wait and only jitters.
+    """
+    try:
+        if r.headers.get("retry-after"):
+            return float(r.headers["retry-after"]) + random.uniform(0, 1)
+        if int(r.headers.get("x-rate-limit-remaining") or 0) > 0:
+            return random.uniform(0, BACKOFF_BASE)
+        if r.headers.get("x-rate-limit-reset"):
+            return max(0.0, float(r.headers["x-rate-limit-reset"]) - time.time()) + random.uniform(0, 1)
+    except ValueError:
+        pass
+    return random.uniform(0, min(30.0, BACKOFF_BASE * 2 ** attempt))
+
+
+def _pacing_wait() -> Optional[float]:
+    """Seconds to wait before the next call, or None if the window resets beyond MAX_RATE_WAIT."""
+    wait = _SEARCH_LIMITER.delay()
+    if wait > MAX_RATE_WAIT:
+        # Sleeping the cap and then sending would only buy a certain 429
+        print(f"⏳ X API rate limit exhausted, resets in {wait:.0f}s; skipping request")
+        return None
+    if wait >= 1:
+        print(f"⏳ Pacing X API calls, waiting {wait:.0f}s...")
+    return wait
+
+
+def _send(url: str, params: Dict) -> Optional[requests.Response]:
+    wait = _pacing_wait()
+    if wait is None:
+        return None
+    if wait > 0:
+        time.sleep(wait)
+    r = _SESSION.get(url, auth=_auth(), params=params, timeout=20)
+    _SEARCH_LIMITER.update(r.headers)
+    return r
+
+
+def _get_throttled(url: str, params: Dict) -> Optional[requests.Response]:
+    """Paced GET; a RETRY_STATUSES response is retried once, after _backoff, if that comes within MAX_RATE_WAIT.
+
+    None when the rate-limit window is spent and resets beyond MAX_RATE_WAIT.
+    """
+    r = _send(url, params)
+    if r is not None and r.status_code in RETRY_STATUSES:
+        wait = _backoff(r, 0)
+        if wait <= MAX_RATE_WAIT:
+            time.sleep(wait)
+            r = _send(url, params)
+    return r
+
+
+@functools.lru_cache(maxsize=1)
+def _async_auth() -> x_client.OAuth1Auth:
+    return x_client.OAuth1Auth(_auth())
+
+
+async def _asend(url: str, params: Dict) -> Optional[httpx.Response]:
+    wait = _pacing_wait()
+    if wait is None:
+        return None
+    if wait > 0:
+        await asyncio.sleep(wait)
+    r = await x_client.get_client().get(url, params=params, auth=_async_auth())
+    _SEARCH_LIMITER.update(r.headers)
+    return r
+
+
+async def _aget_throttled(url: str, params: Dict) -> Optional[httpx.Response]:
+    """Async _get_throttled over the shared HTTP/2 client."""
+    r = await _asend(url, params)
+    if r is not None and r.status_code in RETRY_STATUSES:
+        wait = _backoff(r, 0)
+        if wait <= MAX_RATE_WAIT:
+            await asyncio.sleep(wait)
+            r = await _asend(url, params)
+    return r
+
+
+def _finish(r, key: str, label: str) -> Optional[Dict]:
+    """JSON body of a search/recent response (requests or httpx), cached; None after reporting an error.
+
+    `r` is None when the request was skipped because the rate-limit window is spent.
+    """
+    if r is None:
+        return None
     if r.status_code != 200:
-        # Detailed error reporting
+        # Detailed error reporting; the body is parsed once, falling back to raw text
         try:
-            error_data = r.json()
-            print(f"❌ x_search error: {r.status_code} {error_data}")
-            
-            # Provide helpful context for common errors
-            if r.status_code == 401:
-                print("   → Authentication failed. Check your X API credentials.")
-                print("   → Run: python -m src.validate_x_auth")
-            elif r.status_code == 403:
-                print("   → Access forbidden. Check API access level and permissions.")
-            elif r.status_code == 429:
-                reset_time = r.headers.get("x-rate-limit-reset", "unknown")
-                print(f"   → Rate limit exceeded. Resets at: {reset_time}")
-        except Exception:
-            print(f"❌ x_search error: {r.status_code} {r.text[:200]}")
-        return []
+            body = orjson.loads(r.content)
+        except ValueError:
+            body = r.text[:200]
+        print(f"❌ {label} error: {r.status_code} {body}")
+        
+        # Provide helpful context for common errors
+        if r.status_code == 401:
+            print("   → Authentication failed. Check your X API credentials.")
+            print("   → Run: python -m src.validate_x_auth")
+        elif r.status_code == 403:
+            print("   → Access forbidden. Check API access level and permissions.")
+        elif r.status_code == 429:
+            reset_time = r.headers.get("x-rate-limit-reset", "unknown")
+            print(f"   → Rate limit exceeded. Resets at: {reset_time}")
+        return None
+    x_cache.put(key, r.content)
+    return orjson.loads(r.content) or {}
+
+
+def _get_recent(params: Dict, label: str) -> Optional[Dict]:
+    """Paced GET of search/recent; returns the JSON body, or None after reporting an error."""
+    key = x_cache.cache_key(SEARCH_RECENT_URL, params)
+    cached = x_cache.get(key)
+    if cached is not None:
+        return cached
+    return _finish(_get_throttled(SEARCH_RECENT_URL, params), key, label)
+
+
+async def _aget_recent(params: Dict, label: str) -> Optional[Dict]:
+    """Async _get_recent."""
+    key = x_cache.cache_key(SEARCH_RECENT_URL, params)
+    cached = x_cache.get(key)
+    if cached is not None:
+        return cached
+    return _finish(await _aget_throttled(SEARCH_RECENT_URL, params), key, label)
+
+
+def _index_users(data: Dict) -> Dict[str, Dict]:
+    """author_id -> user object from a response's includes; entries without an id are dropped."""
+    users = (data.get("includes") or _EMPTY).get("users") or ()
+    return {u["id"]: u for u in users if "id" in u}
+
+
+def _likes(t: Dict) -> int:
+    return (t.get("public_metrics") or _EMPTY).get("like_count") or 0
+
+
+def _standardize(data: Dict, by_engagement: bool = False) -> Iterator[Dict]:
+    """Lazily turn a search/recent response into standardized posts.
 
-    data = r.json() or {}
+    With `by_engagement`, most-liked tweets come first, so a caller taking the
+    first N gets the strongest of the overfetched page rather than the newest.
+    """
     tweets = data.get("data", [])
-    users = {u.get("id"): u for u in (data.get("includes", {}).get("users", []) or [])}
+    if by_engagement:
+        tweets = sorted(tweets, key=_likes, reverse=True)
+    users = _index_users(data)
 
-    results: List[Dict] = []
     for t in tweets:
         tid = t.get("id")
         txt = (t.get("text") or "").strip()
-        uid = t.get("author_id")
-        u = users.get(uid, {})
-        handle = u.get("username") or ""
-        verified = bool(u.get("verified"))
-        followers = (u.get("public_metrics") or {}).get("followers_count")
-        if not (tid and handle and txt):
+        if not (tid and txt):
+            continue
+        u = users.get(t.get("author_id"), _EMPTY)
+        handle = u.get("username")
+        if not handle:
             continue
-        results.append({
+        yield {
             "id": tid,
             "tweet_id": tid,
             "handle": handle,
             "text": txt,
             "url": f"https://twitter.com/{handle}/status/{tid}",
-            "verified": verified,
-            "followers": followers,
-        })
-        if len(results) >= limit:
+            "verified": bool(u.get("verified")),
+            "followers": (u.get("public_metrics") or _EMPTY).get("followers_count"),
+        }
+
+
+_BASE_PARAMS = MappingProxyType({
+    "tweet.fields": "author_id,text,created_at,public_metrics",
+    "expansions": "author_id",
+    "user.fields": "username,verified,public_metrics",
+})
+_KOL_CLAUSE = 'KOL OR "key opinion leader" OR influencer'
+_KOL_PARAMS = MappingProxyType({**_BASE_PARAMS, "max_results": "25"})
+# Without the author expansion the response carries no includes.users block
+_KOL_PARAMS_NO_AUTHOR = MappingProxyType({"tweet.fields": _BASE_PARAMS["tweet.fields"], "max_results": "25"})
+
+
+def _search_params(query: str, max_results: int) -> Dict:
+    return {**_BASE_PARAMS, "query": query, "max_results": str(max_results)}
+
+
+def _topic_params(topic: str, limit: int) -> Dict:
+    # Build query similar to UI query
+    query = f"{topic} -is:reply -is:retweet"
+    return _search_params(query, max(10, min(100, limit * 3)))  # overfetch a bit
+
+
+def search_recent_for_topic(topic: str, limit: int = 5) -> List[Dict]:
+    """Search recent tweets for a topic using X API v2. Returns standardized posts."""
+    data = _get_recent(_topic_params(topic, limit), "x_search")
+    if data is None:
+        return []
+    return list(itertools.islice(_standardize(data, by_engagement=True), limit))
+
+
+async def asearch_recent_for_topic(topic: str, limit: int = 5) -> List[Dict]:
+    """Async search_recent_for_topic."""
+    data = await _aget_recent(_topic_params(topic, limit), "x_search")
+    if data is None:
+        return []
+    return list(itertools.islice(_standardize(data, by_engagement=True), limit))
+
+
+class _TopicBuckets:
+    """Per-topic result buckets for one combined OR query, filled page by page."""
+
+    def __init__(self, topics: List[str], limit_per_topic: int):
+        self.limit = limit_per_topic
+        self.terms = [[w.strip('"()').lower() for w in t.split()] for t in topics]
+        self.buckets: List[List[Dict]] = [[] for _ in topics]
+        self.spare: List[Dict] = []
+
+    def add_page(self, data: Dict) -> Optional[str]:
+        """Bucket one page by term match; returns the next_token if more posts are still wanted."""
+        for post in _standardize(data):
+            text = post["text"].lower()
+            for bucket, words in zip(self.buckets, self.terms):
+                if len(bucket) < self.limit and all(w in text for w in words):
+                    bucket.append(post)
+                    break
+            else:
+                self.spare.append(post)
+        if all(len(b) >= self.limit for b in self.buckets):
+            return None
+        return (data.get("meta") or _EMPTY).get("next_token")
+
+    def posts(self) -> List[Dict]:
+        # Matches the API made on terms we can't see in the text (links, cashtag
+        # entities) top up topics that came back short
+        for bucket in self.buckets:
+            while self.spare and len(bucket) < self.limit:
+                bucket.append(self.spare.pop(0))
+        return [p for bucket in self.buckets for p in bucket]
+
+
+def _combined_params(topics: List[str], limit_per_topic: int) -> Optional[Dict]:
+    """Params for all topics in one OR query, or None if it would exceed MAX_QUERY_LEN."""
+    query = "(" + " OR ".join(f"({t})" for t in topics) + ") -is:reply -is:retweet"
+    if len(query) > MAX_QUERY_LEN:
+        return None
+    return _search_params(query, max(10, min(100, limit_per_topic * len(topics) * 3)))
+
+
+def _search_combined(topics: List[str], limit_per_topic: int) -> Optional[List[Dict]]:
+    """All topics in one OR query, bucketed back per topic by term match.
+
+    Returns None when the query would exceed MAX_QUERY_LEN, or when the first
+    page fails or carries no data, so the caller can search per topic instead.
+    """
+    params = _combined_params(topics, limit_per_topic)
+    if params is None:
+        return None
+    buckets = _TopicBuckets(topics, limit_per_topic)
+    for page in range(MAX_COMBINED_PAGES):
+        data = _get_recent(params, "x_search")
+        if page == 0 and not (data and data.get("data")):
+            return None
+        next_token = buckets.add_page(data) if data is not None else None
+        if not next_token:
             break
-    return results
+        params["next_token"] = next_token
+    return buckets.posts()
 
 
-def search_recent_topics(topics: List[str], limit_per_topic: int = 5) -> List[Dict]:
-    all_results: List[Dict] = []
-    for topic in topics:
+async def _asearch_combined(topics: List[str], limit_per_topic: int) -> Optional[List[Dict]]:
+    """Async _search_combined."""
+    params = _combined_params(topics, limit_per_topic)
+    if params is None:
+        return None
+    buckets = _TopicBuckets(topics, limit_per_topic)
+    for page in range(MAX_COMBINED_PAGES):
+        data = await _aget_recent(params, "x_search")
+        if page == 0 and not (data and data.get("data")):
+            return None
+        next_token = buckets.add_page(data) if data is not None else None
+        if not next_token:
+            break
+        params["next_token"] = next_token
+    return buckets.posts()
+
+
+def _search_topic_safe(topic: str, limit: int) -> List[Dict]:
+    try:
+        return search_recent_for_topic(topic, limit=limit)
+    except Exception as e:
+        print(f"x_search topic error for '{topic}':", e)
+        return []
+
+
+async def _asearch_topic_safe(topic: str, limit: int, sem: asyncio.Semaphore) -> List[Dict]:
+    async with sem:
         try:
-            all_results.extend(search_recent_for_topic(topic, limit=limit_per_topic))
+            return await asearch_recent_for_topic(topic, limit=limit)
         except Exception as e:
             print(f"x_search topic error for '{topic}':", e)
-    # Deduplicate by id
-    seen = set()
-    unique: List[Dict] = []
-    for p in all_results:
+            return []
+
+
+def _extend_unique(unique: Dict[str, Dict], posts: List[Dict]) -> None:
+    # Deduplicate by id while merging; one insertion-ordered dict, first post wins
+    setdefault = unique.setdefault
+    for p in posts:
         pid = p.get("id")
-        if pid and pid not in seen:
-            seen.add(pid)
-            unique.append(p)
-    return unique
+        if pid:
+            setdefault(pid, p)
 
 
-def search_kol_recent(topics: List[str], limit: int = 1, hours: int = 12, min_replies: int = 10, min_faves: int = 10) -> List[Dict]:
-    """Single-call KOL-oriented recent search with server-side engagement filters.
-    
-    Searches for tweets matching topics + KOL terms with minimum engagement thresholds.
-    Supports cashtags (e.g., $POL), hashtags, and keywords.
-    
-    Args:
-        topics: List of search terms (can include cashtags like $POL, hashtags, keywords)
-        limit: Maximum number of results to return
-        hours: Time window in hours (tweets must be within this timeframe)
-        min_replies: Minimum number of replies required (default: 10)
-        min_faves: Minimum number of favorites/likes required (default: 10)
-    
-    Returns:
-        List of standardized post dictionaries
-    """
-    base = "https://api.twitter.com/2/tweets/search/recent"
+def search_recent_topics(topics: List[str], limit_per_topic: int = 5) -> List[Dict]:
+    """Search all topics in one OR query (per topic, concurrently, if it's too long), merged in topic order."""
+    unique: Dict[str, Dict] = {}
+    if not topics:
+        return []
+    combined = None
+    if len(topics) > 1:
+        try:
+            combined = _search_combined(topics, limit_per_topic)
+        except Exception as e:
+            print("x_search combined query error:", e)
+            combined = None  # fall back to per-topic searches
+    if combined is not None:
+        _extend_unique(unique, combined)
+    else:
+        with ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(topics))) as ex:
+            for posts in ex.map(lambda t: _search_topic_safe(t, limit_per_topic), topics):
+                _extend_unique(unique, posts)
+    return list(unique.values())
+
+
+async def asearch_recent_topics(topics: List[str], limit_per_topic: int = 5) -> List[Dict]:
+    """Async search_recent_topics; the per-topic fallback is gathered over one HTTP/2 connection."""
+    unique: Dict[str, Dict] = {}
+    if not topics:
+        return []
+    combined = None
+    if len(topics) > 1:
+        try:
+            combined = await _asearch_combined(topics, limit_per_topic)
+        except Exception as e:
+            print("x_search combined query error:", e)
+            combined = None  # fall back to per-topic searches
+    if combined is not None:
+        _extend_unique(unique, combined)
+    else:
+        sem = asyncio.Semaphore(SEARCH_WORKERS)
+        for posts in await asyncio.gather(*(_asearch_topic_safe(t, limit_per_topic, sem) for t in topics)):
+            _extend_unique(unique, posts)
+    return list(unique.values())
+
+
+def _kol_params(topics: List[str], with_author: bool = True) -> Dict:
     if not topics:
         topics = ["web3"]
     
@@ -152,106 +484,134 @@ def search_kol_recent(topics: List[str], limit: int = 1, hours: int = 12, min_re
     
     topics_clause = " OR ".join(processed_topics)
     
-    # KOL terms
-    kol_clause = 'KOL OR "key opinion leader" OR influencer'
-    
     # Build query with valid X API v2 operators
     # Note: min_replies and min_faves are not supported in API v2, we'll filter client-side
     # Format: (topics) (KOL terms) -is:reply -is:retweet
-    query = f"({topics_clause}) ({kol_clause}) -is:reply -is:retweet"
+    query = f"({topics_clause}) ({_KOL_CLAUSE}) -is:reply -is:retweet"
     
-    params = {
-        "query": query,
-        "max_results": "25",
-        "tweet.fields": "author_id,text,created_at,public_metrics",
-        "expansions": "author_id",
-        "user.fields": "username,verified,public_metrics",
-    }
-    
-    print(f"🔍 Search query: {query}")
-    for i in range(3):
-        r = requests.get(base, auth=_auth(), params=params, timeout=20)
-        if r.status_code != 429:
-            break
-        print(f"⚠️  Rate limited (429), retrying in {2 * (i + 1)}s...")
-        time.sleep(2 * (i + 1))
-    
-    if r.status_code != 200:
-        # Detailed error reporting
-        try:
-            error_data = r.json()
-            print(f"❌ x_search KOL error: {r.status_code} {error_data}")
-            
-            # Provide helpful context for common errors
-            if r.status_code == 401:
-                print("   → Authentication failed. Check your X API credentials.")
-                print("   → Run: python -m src.validate_x_auth")
-            elif r.status_code == 403:
-                print("   → Access forbidden. Check API access level and permissions.")
-            elif r.status_code == 429:
-                reset_time = r.headers.get("x-rate-limit-reset", "unknown")
-                print(f"   → Rate limit exceeded. Resets at: {reset_time}")
-        except Exception:
-            print(f"❌ x_search KOL error: {r.status_code} {r.text[:200]}")
-        return []
-    data = r.json() or {}
+    return {**(_KOL_PARAMS if with_author else _KOL_PARAMS_NO_AUTHOR), "query": query}
+
+
+def _yield_kol(
+    data: Dict, hours: int, min_replies: int, min_faves: int, min_followers: int, with_author: bool
+) -> Iterator[Dict]:
+    """Lazily yield the KOL posts in a search/recent response that pass every filter.
+
+    Without author data there is no handle, follower count or verified flag, so
+    the follower filter is skipped and the URL uses the handle-less /i/web form.
+    """
     tweets = data.get("data", [])
-    users = {u.get("id"): u for u in (data.get("includes", {}).get("users", []) or [])}
-    now = datetime.now(timezone.utc)
-    cutoff = now - timedelta(hours=max(1, hours))
+    users_get = _index_users(data).get
+    # created_at is fixed-width UTC ISO-8601 ("2024-05-01T12:00:00.000Z"), so the
+    # window check is a plain string comparison against an epoch-derived cutoff,
+    # no per-tweet datetime parsing and no tz-aware datetimes at all
+    cutoff_iso = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(time.time() - max(1, hours) * 3600))
 
-    results: List[Dict] = []
     for t in tweets:
+        # Cheapest checks first; each skip avoids the remaining lookups
         tid = t.get("id")
         txt = (t.get("text") or "").strip()
-        uid = t.get("author_id")
-        u = users.get(uid, {})
-        handle = u.get("username") or ""
-        verified = bool(u.get("verified"))
-        followers = (u.get("public_metrics") or {}).get("followers_count") or 0
-        pm = t.get("public_metrics") or {}
-        reply_count = pm.get("reply_count") or 0
-        like_count = pm.get("like_count") or 0
-        created_at = t.get("created_at")
-        try:
-            created_dt = datetime.fromisoformat(created_at.replace("Z", "+00:00")) if created_at else None
-        except Exception:
-            created_dt = None
-
-        # Basic validation
-        if not (tid and handle and txt):
-            continue
-        
-        # Client-side filters as backup validation (server should already filter these)
-        # Keep follower threshold since there's no server-side operator for it
-        if followers < 10000:
+        if not (tid and txt):
             continue
+        handle, followers, u = "", None, _EMPTY
+        if with_author:
+            u = users_get(t.get("author_id"), _EMPTY)
+            handle = u.get("username") or ""
+            if not handle:
+                continue
+            
+            # Client-side filters as backup validation (server should already filter these)
+            # Keep follower threshold since there's no server-side operator for it
+            followers = (u.get("public_metrics") or _EMPTY).get("followers_count") or 0
+            if followers < min_followers:
+                continue
         
         # Double-check engagement metrics match our requirements
+        pm = t.get("public_metrics") or _EMPTY
+        reply_count = pm.get("reply_count") or 0
         if reply_count < min_replies:
             continue
+        like_count = pm.get("like_count") or 0
         if like_count < min_faves:
             continue
         
         # Time window filter
-        if created_dt and created_dt < cutoff:
+        created_at = t.get("created_at")
+        if created_at and created_at < cutoff_iso:
             continue
+        verified = bool(u.get("verified"))
 
-        results.append({
+        yield {
             "id": tid,
             "tweet_id": tid,
             "handle": handle,
             "text": txt,
-            "url": f"https://twitter.com/{handle}/status/{tid}",
+            "url": f"https://twitter.com/{handle or 'i/web'}/status/{tid}",
             "verified": verified,
             "followers": followers,
             "reply_count": reply_count,
             "like_count": like_count,
-        })
-        if len(results) >= max(1, limit):
-            break
-    
-    print(f"✅ Found {len(results)} posts matching criteria (followers>=10k, replies>={min_replies}, likes>={min_faves})")
+        }
+
+
+def _kol_select(
+    data: Dict, limit: int, hours: int, min_replies: int, min_faves: int, min_followers: int, with_author: bool
+) -> List[Dict]:
+    posts = _yield_kol(data, hours, min_replies, min_faves, min_followers, with_author)
+    results = list(itertools.islice(posts, max(1, limit)))
+    followers_rule = f"followers>={min_followers}, " if with_author else ""
+    print(f"✅ Found {len(results)} posts matching criteria ({followers_rule}replies>={min_replies}, likes>={min_faves})")
     return results
 
 
+def search_kol_recent(
+    topics: List[str],
+    limit: int = 1,
+    hours: int = 12,
+    min_replies: int = 10,
+    min_faves: int = 10,
+    min_followers: int = 10000,
+    with_author: bool = True,
+) -> List[Dict]:
+    """Single-call KOL-oriented recent search with server-side engagement filters.
+    
+    Searches for tweets matching topics + KOL terms with minimum engagement thresholds.
+    Supports cashtags (e.g., $POL), hashtags, and keywords.
+    
+    Args:
+        topics: List of search terms (can include cashtags like $POL, hashtags, keywords)
+        limit: Maximum number of results to return
+        hours: Time window in hours (tweets must be within this timeframe)
+        min_replies: Minimum number of replies required (default: 10)
+        min_faves: Minimum number of favorites/likes required (default: 10)
+        min_followers: Minimum author follower count (default: 10000)
+        with_author: Expand author data; False requests a smaller response with
+            no handle, followers or verified flag, and skips the follower filter
+    
+    Returns:
+        List of standardized post dictionaries
+    """
+    params = _kol_params(topics, with_author)
+    print(f"🔍 Search query: {params['query']}")
+    data = _get_recent(params, "x_search KOL")
+    if data is None:
+        return []
+    return _kol_select(data, limit, hours, min_replies, min_faves, min_followers, with_author)
+
+
+async def asearch_kol_recent(
+    topics: List[str],
+    limit: int = 1,
+    hours: int = 12,
+    min_replies: int = 10,
+    min_faves: int = 10,
+    min_followers: int = 10000,
+    with_author: bool = True,
+) -> List[Dict]:
+    """Async search_kol_recent."""
+    params = _kol_params(topics, with_author)
+    print(f"🔍 Search query: {params['query']}")
+    data = await _aget_recent(params, "x_search KOL")
+    if data is None:
+        return []
+    return _kol_select(data, limit, hours, min_replies, min_faves, min_followers, with_author)
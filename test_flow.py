@@ -21,35 +21,7 @@ print("\nThis test uses FAKE scraped data and tests reply generation.")
 print("NO calls to X API - completely safe!\n")
 
 # Mock scraped posts (simulating what scraper.py or x_search.py would return)
-MOCK_SCRAPED_POSTS = [
-    {
-        "id": "1234567890123456789",
-        "tweet_id": "1234567890123456789",
-        "handle": "web3builder",
-        "text": "Just launched our new DeFi protocol! Super excited about bringing decentralized finance to more users. Check it out! #web3 #DeFi",
-        "url": "https://twitter.com/web3builder/status/1234567890123456789",
-        "verified": True,
-        "followers": 25000,
-    },
-    {
-        "id": "9876543210987654321",
-        "tweet_id": "9876543210987654321",
-        "handle": "cryptoinfluencer",
-        "text": "Web3 gaming is the future. The ability to truly own your in-game assets changes everything. What's your favorite web3 game?",
-        "url": "https://twitter.com/cryptoinfluencer/status/9876543210987654321",
-        "verified": False,
-        "followers": 50000,
-    },
-    {
-        "id": "5555555555555555555",
-        "tweet_id": "5555555555555555555",
-        "handle": "nftcollector",
-        "text": "The intersection of AI and blockchain is fascinating. We're seeing real-world applications that weren't possible before. Excited for what's next!",
-        "url": "https://twitter.com/nftcollector/status/5555555555555555555",
-        "verified": True,
-        "followers": 15000,
-    },
-]
+from src.mock_posts import MOCK_POSTS as MOCK_SCRAPED_POSTS
 
 print("📊 Mock Scraped Posts:")
 print("-" * 70)
@@ -63,7 +35,7 @@ print("=" * 70)
 
 # Import reply writer
 try:
-    from src.reply_writer import write_reply
+    from src.reply_writer import write_reply, cache_stats
     print("✅ Reply writer module loaded")
 except ImportError as e:
     print(f"❌ Failed to import reply_writer: {e}")
@@ -109,6 +81,9 @@ print("=" * 70)
 print("\nSummary:")
 print(f"  • Tested {len(MOCK_SCRAPED_POSTS)} mock posts")
 print(f"  • Generated replies using reply_writer.py")
+stats = cache_stats()
+if stats:
+    print(f"  • Reused {stats['hits'] + stats['semantic_hits']} cached replies, {stats['misses']} new OpenAI calls")
 print(f"  • No API calls to X (completely safe)")
 print("\nNext steps:")
 print("  1. ✅ Flow logic works with mock data")
@@ -7,6 +7,7 @@ Test OpenAI reply generation with mock scraped data.
 """
 import os
 import sys
+import asyncio
 
 # Try to load .env.local if it exists
 try:
@@ -26,26 +27,7 @@ print("✅ No actual posting (dry run)")
 print()
 
 # Mock scraped posts (simulating what scraper would return)
-MOCK_POSTS = [
-    {
-        "id": "1234567890123456789",
-        "tweet_id": "1234567890123456789",
-        "handle": "web3builder",
-        "text": "Just launched our new DeFi protocol! Super excited about bringing decentralized finance to more users. The composability is insane! #web3 #DeFi",
-        "url": "https://twitter.com/web3builder/status/1234567890123456789",
-        "verified": True,
-        "followers": 25000,
-    },
-    {
-        "id": "9876543210987654321",
-        "tweet_id": "9876543210987654321",
-        "handle": "cryptoinfluencer",
-        "text": "Web3 gaming is changing everything. True ownership of in-game assets means players finally have real value. What's your favorite web3 game? 🎮",
-        "url": "https://twitter.com/cryptoinfluencer/status/9876543210987654321",
-        "verified": False,
-        "followers": 50000,
-    },
-]
+from src.mock_posts import MOCK_POSTS
 
 print("📊 Mock Scraped Posts:")
 print("-" * 70)
@@ -75,7 +57,7 @@ print("🤖 Loading Reply Generator")
 print("=" * 70)
 
 try:
-    from src.reply_writer import write_reply
+    from src.reply_writer import awrite_reply, aembed_texts, aclose, cache_stats
     print("✅ Reply writer loaded successfully")
 except ImportError as e:
     print(f"❌ Failed to import: {e}")
@@ -91,7 +73,24 @@ print("=" * 70)
 successful = 0
 failed = 0
 
-for i, post in enumerate(MOCK_POSTS, 1):
+
+async def _generate_all(posts):
+    # One batched embedding request, then every reply concurrently
+    texts = [p['text'] for p in posts]
+    try:
+        embeddings = await aembed_texts(texts)
+        return await asyncio.gather(
+            *(awrite_reply(t, embedding=e) for t, e in zip(texts, embeddings)),
+            return_exceptions=True,
+        )
+    finally:
+        await aclose()
+
+
+print(f"\n⏳ Calling OpenAI for {len(MOCK_POSTS)} replies concurrently...")
+replies = asyncio.run(_generate_all(MOCK_POSTS))
+
+for i, (post, reply) in enumerate(zip(MOCK_POSTS, replies), 1):
     print(f"\n{'─' * 70}")
     print(f"Post {i}/{len(MOCK_POSTS)}")
     print(f"{'─' * 70}")
@@ -101,8 +100,8 @@ for i, post in enumerate(MOCK_POSTS, 1):
     print(f"\n🔗 {post['url']}")
     
     try:
-        print(f"\n⏳ Calling OpenAI to generate reply...")
-        reply = write_reply(post['text'])
+        if isinstance(reply, Exception):
+            raise reply
         
         print(f"\n✅ Generated Reply:")
         print(f"   {reply}")
@@ -133,6 +132,10 @@ print("=" * 70)
 print(f"\n  Total posts:      {len(MOCK_POSTS)}")
 print(f"  ✅ Successful:    {successful}")
 print(f"  ❌ Failed:        {failed}")
+stats = cache_stats()
+if stats:
+    # Re-runs reuse replies from the on-disk cache instead of calling OpenAI again
+    print(f"  ♻️  Cached:        {stats['hits'] + stats['semantic_hits']} (new calls: {stats['misses']})")
 
 if successful > 0:
     print("\n✅ OpenAI reply generation is working!")
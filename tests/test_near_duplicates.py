@@ -0,0 +1,32 @@
+import unittest
+
+from src import main
+
+
+class NearDuplicateTest(unittest.TestCase):
+    def test_distinct_emoji_only_posts_are_kept(self):
+        posts = [
+            {"tweet_id": "1", "text": "🚀🚀🚀"},
+            {"tweet_id": "2", "text": "🎮🔥"},
+        ]
+        self.assertEqual([p["tweet_id"] for p in main._drop_near_duplicates(posts)], ["1", "2"])
+
+    def test_link_and_mention_only_posts_are_kept(self):
+        posts = [
+            {"tweet_id": "1", "text": "https://t.co/abc"},
+            {"tweet_id": "2", "text": "@someone"},
+            {"tweet_id": "3", "text": ""},
+        ]
+        self.assertEqual(len(main._drop_near_duplicates(posts)), 3)
+
+    def test_reposted_text_is_dropped(self):
+        text = "Web3 gaming is changing everything, true ownership of in-game assets"
+        posts = [
+            {"tweet_id": "1", "text": text},
+            {"tweet_id": "2", "text": text + " https://t.co/xyz @friend"},
+        ]
+        self.assertEqual([p["tweet_id"] for p in main._drop_near_duplicates(posts)], ["1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+from src import main
+from src.bloom import BloomFilter
+
+
+class BloomStateTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self._threshold = main.BLOOM_THRESHOLD
+        main.BLOOM_THRESHOLD = 500
+
+    def tearDown(self):
+        main.BLOOM_THRESHOLD = self._threshold
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _append(self, start, n):
+        with open(main.STATE_FILE, 'a') as f:
+            f.write("".join(f"{i}\n" for i in range(start, start + n)))
+
+    def test_fpr_stays_near_error_rate_past_capacity(self):
+        # Grow to 20x the first snapshot's capacity, loading between batches like repeated runs
+        total = 0
+        while total < 20_000:
+            self._append(total, 1_000)
+            total += 1_000
+            state = main.load_state()
+        self.assertIsInstance(state, BloomFilter)
+        self.assertFalse(state.overfull())
+        for tid in ("0", "12345", str(total - 1)):
+            self.assertIn(tid, state)
+        unseen = [f"x{i}" for i in range(20_000)]
+        fpr = sum(tid in state for tid in unseen) / len(unseen)
+        self.assertLess(fpr, 0.03)
+
+    def test_long_tail_is_folded_into_the_snapshot(self):
+        self._append(0, 600)
+        first = main.load_state()
+        self._append(600, 200)
+        main.load_state()
+        with open(main.BLOOM_FILE, 'rb') as f:
+            (offset,) = main._BLOOM_OFFSET.unpack_from(f.read())
+        self.assertEqual(offset, os.path.getsize(main.STATE_FILE))
+        self.assertEqual(first.capacity, 2 * 600)
+
+    def test_save_state_is_seen_on_next_load(self):
+        self._append(0, 600)
+        main.load_state()
+        main.save_state("999999")
+        self.assertIn("999999", main.load_state())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("X_CACHE_DISABLE", "1")
+
+from src import x_search
+
+
+def _page(tid, text):
+    return {
+        "data": [{"id": tid, "text": text, "author_id": "u1"}],
+        "includes": {"users": [{"id": "u1", "username": "builder"}]},
+    }
+
+
+def _fake_get_recent(params, label):
+    if " OR " in params["query"]:
+        raise RuntimeError("combined query failed")
+    topic = params["query"].split(" -is:")[0]
+    return _page(topic.replace(" ", "-"), f"about {topic}")
+
+
+class CombinedFallbackTest(unittest.TestCase):
+    topics = ["Web3 growth", "KOL marketing"]
+
+    def test_per_topic_results_when_combined_query_raises(self):
+        with mock.patch.object(x_search, "_get_recent", _fake_get_recent):
+            posts = x_search.search_recent_topics(self.topics, limit_per_topic=1)
+        self.assertEqual([p["id"] for p in posts], ["Web3-growth", "KOL-marketing"])
+
+    def test_async_per_topic_results_when_combined_query_raises(self):
+        async def fake(params, label):
+            return _fake_get_recent(params, label)
+
+        with mock.patch.object(x_search, "_aget_recent", fake):
+            posts = asyncio.run(x_search.asearch_recent_topics(self.topics, limit_per_topic=1))
+        self.assertEqual([p["id"] for p in posts], ["Web3-growth", "KOL-marketing"])
+
+    def test_per_topic_results_when_combined_query_fails(self):
+        def get_recent(params, label):
+            if " OR " in params["query"]:
+                return None  # non-200, already reported
+            return _fake_get_recent(params, label)
+
+        with mock.patch.object(x_search, "_get_recent", get_recent):
+            posts = x_search.search_recent_topics(self.topics, limit_per_topic=1)
+        self.assertEqual(len(posts), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()